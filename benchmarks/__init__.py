@@ -0,0 +1 @@
+# Benchmarks hors ligne (sans connexion Discord) : voir benchmarks/run.py
@@ -0,0 +1,203 @@
+# Générateur de jeu de données LCSP synthétique (benchmarks/dataset.py)
+#
+# Remplit une base locale avec des membres, des réunions (avec rôles ciblés),
+# des présences et des tickets. ATTENTION : les tables sont vidées.
+#
+#   DATABASE_URL=postgresql://... DB_PORT=5432 \
+#       python -m benchmarks.dataset --members 1000 --meetings 500 --reset
+
+import argparse
+import random
+import sys
+from datetime import datetime, timedelta
+from sqlalchemy import insert, text
+import migrations
+from models import (
+    Base,
+    Session,
+    engine,
+    init_database,
+    rebuild_attendance_summary,
+    Attendance,
+    Meeting,
+    Member,
+    MemberStatus,
+    Ticket,
+    TicketStatus,
+    TicketType,
+)
+
+POLES = ["DEV", "IA", "INFRA"]
+
+# Ensembles de rôles ciblés possibles pour une réunion et leur fréquence
+TARGET_ROLES = [
+    (["ALL"], 4),
+    (["DEV"], 2),
+    (["IA"], 2),
+    (["INFRA"], 2),
+    (["DEV", "IA"], 1),
+    (["IA", "INFRA"], 1),
+]
+
+# Nombre de lignes insérées par requête
+BATCH_SIZE = 5000
+
+
+def _batched_insert(session, model, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        session.execute(insert(model), rows[start : start + BATCH_SIZE])
+
+
+def generate(members=1000, meetings=500, tickets=300, days=365, seed=42):
+    """Vider la base et la remplir avec un jeu de données synthétique
+
+    Retourne le nombre de lignes créées par table.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    Base.metadata.drop_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS schema_migrations"))
+    init_database()
+    migrations.upgrade()
+
+    with Session() as session:
+        # Membres : répartis entre les pôles, majoritairement actifs
+        member_rows = []
+        for i in range(members):
+            joined = now - timedelta(days=rng.randint(0, days * 2))
+            member_rows.append(
+                {
+                    "discord_id": str(100000000000000000 + i),
+                    "username": f"membre{i}",
+                    "full_name": f"Membre {i:05d}",
+                    "email": f"membre{i}@lcsp.fr" if rng.random() < 0.7 else None,
+                    "role": rng.choice(POLES) if rng.random() < 0.95 else None,
+                    "specialization": rng.choice(["web", "réseau", "ml", None]),
+                    "status": rng.choices(list(MemberStatus), weights=[85, 12, 3], k=1)[
+                        0
+                    ],
+                    "joined_at": joined,
+                    "last_active": joined,
+                }
+            )
+        _batched_insert(session, Member, member_rows)
+        roster = session.query(Member.id, Member.role, Member.status).all()
+
+        # Réunions : 90 % passées (validées pour la plupart), 10 % à venir
+        created = []
+        for i in range(meetings):
+            if rng.random() < 0.9:
+                date = now - timedelta(days=rng.uniform(0, days))
+            else:
+                date = now + timedelta(days=rng.uniform(0, 60))
+            roles = rng.choices(
+                [r for r, _ in TARGET_ROLES], weights=[w for _, w in TARGET_ROLES]
+            )[0]
+            validated = date < now and rng.random() < 0.9
+            meeting = Meeting(
+                title=f"Réunion {i:04d}",
+                description="Réunion générée pour les benchmarks",
+                date=date.replace(second=0, microsecond=0),
+                created_by=member_rows[0]["discord_id"],
+                is_completed=validated,
+                attendance_validated=validated,
+                attendance_validated_at=date if validated else None,
+            )
+            meeting.set_target_roles(roles)
+            session.add(meeting)
+            created.append((meeting, roles, validated))
+        session.flush()
+
+        # Présences des membres actifs ciblés sur les réunions validées
+        attendance_rows = []
+        for meeting, roles, validated in created:
+            if not validated:
+                continue
+            for member_id, role, status in roster:
+                if status != MemberStatus.ACTIVE:
+                    continue
+                if "ALL" not in roles and role not in roles:
+                    continue
+                attendance_rows.append(
+                    {
+                        "meeting_id": meeting.id,
+                        "member_id": member_id,
+                        "status": rng.choices(
+                            ["present", "absent", "excused"], weights=[70, 20, 10]
+                        )[0],
+                        "timestamp": meeting.date,
+                    }
+                )
+        _batched_insert(session, Attendance, attendance_rows)
+
+        # Tickets : demandes d'entrée au labo ou dans un pôle
+        ticket_rows = []
+        for i in range(tickets):
+            created_at = now - timedelta(days=rng.uniform(0, days))
+            ticket_type = rng.choice(list(TicketType))
+            status = rng.choices(list(TicketStatus), weights=[20, 75, 5])[0]
+            closed = status == TicketStatus.CLOSED
+            ticket_rows.append(
+                {
+                    "discord_user_id": str(
+                        200000000000000000 + rng.randint(0, tickets)
+                    ),
+                    "discord_username": f"visiteur{i}",
+                    "channel_id": str(300000000000000000 + i),
+                    "type": ticket_type,
+                    "pole_requested": (
+                        rng.choice(POLES)
+                        if ticket_type == TicketType.JOIN_POLE
+                        else None
+                    ),
+                    "reason": "Ticket généré pour les benchmarks",
+                    "status": status,
+                    "created_at": created_at,
+                    "closed_at": (
+                        created_at + timedelta(hours=rng.uniform(1, 240))
+                        if closed
+                        else None
+                    ),
+                    "closed_by": member_rows[0]["discord_id"] if closed else None,
+                }
+            )
+        _batched_insert(session, Ticket, ticket_rows)
+
+        rebuild_attendance_summary(session)
+        session.commit()
+
+    return {
+        "members": len(member_rows),
+        "meetings": len(created),
+        "attendances": len(attendance_rows),
+        "tickets": len(ticket_rows),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Jeu de données LCSP synthétique")
+    parser.add_argument("--members", type=int, default=1000)
+    parser.add_argument("--meetings", type=int, default=500)
+    parser.add_argument("--tickets", type=int, default=300)
+    parser.add_argument("--days", type=int, default=365, help="Historique (jours)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--reset", action="store_true", help="Confirme la suppression des tables"
+    )
+    args = parser.parse_args(argv)
+
+    if not args.reset:
+        print(f"❌ Toutes les tables de {engine.url!r} seront vidées : ajoutez --reset")
+        return 1
+
+    counts = generate(args.members, args.meetings, args.tickets, args.days, args.seed)
+    print(
+        "✅ Jeu de données généré: " + ", ".join(f"{k}={v}" for k, v in counts.items())
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+# Benchmarks hors ligne des requêtes du bot (benchmarks/run.py)
+#
+# Chronomètre les méthodes de Database et le chemin de données des commandes
+# de rapport (sans connexion Discord), compte les requêtes SQL émises et écrit
+# les résultats en JSON pour comparer deux commits.
+#
+#   python -m benchmarks.run --generate --reset --members 1000 --meetings 500 \
+#       --output bench.json --baseline bench_precedent.json
+
+import argparse
+import asyncio
+import inspect
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import func
+import database
+from benchmarks import dataset
+from cogs.members.info_member import InfoMember
+from cogs.members.list_member import ListMember
+from cogs.reports.export import Export
+from cogs.reports.report import Report
+from cogs.reports.stats_labo import LaboStats
+from cogs.reports.stats_pole import PoleStats
+from database import AsyncDatabase, Database, stats_cache
+from models import (
+    AsyncSession,
+    Session,
+    dispose_async_engine,
+    engine,
+    query_scope,
+    Attendance,
+    Meeting,
+    Member,
+    MemberStatus,
+    Ticket,
+)
+from views.adminAttendanceView import AdminAttendanceView
+
+POLES = ["DEV", "IA", "INFRA"]
+
+
+async def measure(name, func, repeat):
+    """Exécuter func repeat fois (cache des statistiques vidé) et résumer
+
+    func peut être une fonction ou une coroutine (cogs et vues). Les requêtes
+    sont comptées par query_scope, sur l'engine synchrone comme asynchrone.
+    """
+    durations = []
+    queries = 0
+    for _ in range(repeat):
+        stats_cache.clear()
+        with query_scope(name) as scope:
+            start = time.perf_counter()
+            result = func()
+            if inspect.isawaitable(result):
+                await result
+            durations.append((time.perf_counter() - start) * 1000)
+        queries = scope.count
+    return {
+        "name": name,
+        "runs": repeat,
+        "min_ms": round(min(durations), 3),
+        "median_ms": round(statistics.median(durations), 3),
+        "mean_ms": round(statistics.mean(durations), 3),
+        "queries": queries,
+    }
+
+
+# --- Chemins de données des commandes : méthodes des cogs et des vues ---
+# Première page de /membres (les suivantes sont construites à la demande)
+async def members_command():
+    _, render_page = await ListMember(None).prepare_pages(None, None, None, None)
+    await render_page(0)
+
+
+def export_command(type):
+    with tempfile.TemporaryFile() as output:
+        Export(None).write_export(type, output, False)
+
+
+# Exécute coro_func dans une transaction annulée à la fin : les écritures ne
+# modifient pas le jeu de données d'une répétition (ou d'un commit) à l'autre
+async def rolled_back(coro_func):
+    async with AsyncSession() as session:
+        token = database._current_unit.set((session, asyncio.Lock()))
+        try:
+            await coro_func()
+        finally:
+            database._current_unit.reset(token)
+            await session.rollback()
+
+
+# Appel complet d'une réunion pour tous les membres (AdminAttendanceView) :
+# chargement des membres attendus, marquage d'un membre sur deux, validation
+async def attendance_view():
+    db = AsyncDatabase()
+    meeting = await db.create_meeting(
+        title="Benchmark appel",
+        date=datetime.utcnow() - timedelta(hours=1),
+        created_by="0",
+        target_roles=["ALL"],
+    )
+    members = await db.get_members_by_roles(meeting.get_target_roles())
+    view = AdminAttendanceView(meeting.id, db, "0", members)
+    await view.load_existing_attendance()
+    for member in members[::2]:
+        await view.record_status(member.id, "present", "0")
+    await view.save_validation("0")
+    view.stop()
+
+
+def build_cases():
+    with Session() as session:
+        member = session.query(Member).filter(Member.status == MemberStatus.ACTIVE)
+        member = member.first()
+        meeting_id = (
+            session.query(Meeting.id)
+            .filter(Meeting.attendance_validated == True)
+            .order_by(Meeting.date.desc())
+            .limit(1)
+            .scalar()
+        )
+        active_ids = [
+            row.id
+            for row in session.query(Member.id).filter(
+                Member.status == MemberStatus.ACTIVE
+            )
+        ]
+    if member is None or meeting_id is None:
+        raise SystemExit("❌ Base vide : lancez avec --generate")
+
+    cases = [
+        ("Database.get_member_stats", lambda: Database.get_member_stats(member.id)),
+        (
+            "Database.get_members_stats (membres actifs)",
+            lambda: Database.get_members_stats(active_ids, days=30),
+        ),
+        ("Database.get_global_stats (30j)", lambda: Database.get_global_stats(30)),
+        ("Database.get_global_stats (365j)", lambda: Database.get_global_stats(365)),
+        ("Database.get_meeting_stats", lambda: Database.get_meeting_stats(meeting_id)),
+        (
+            "Database.get_upcoming_meetings",
+            lambda: Database.get_upcoming_meetings(limit=3, role="DEV"),
+        ),
+        (
+            "Database.get_member_upcoming_meetings",
+            lambda: Database.get_member_upcoming_meetings(member.id),
+        ),
+        (
+            "Database.search_members",
+            lambda: Database.search_members(member.full_name[:6], limit=11),
+        ),
+        ("Database.get_ticket_stats", Database.get_ticket_stats),
+        ("Database.get_open_tickets", Database.get_open_tickets),
+        (
+            "Database.get_open_tickets_page",
+            lambda: Database.get_open_tickets_page(5, last=True),
+        ),
+        ("Database.count_open_tickets", Database.count_open_tickets),
+    ]
+    for pole in POLES:
+        cases.append(
+            (
+                f"Database.get_role_stats ({pole})",
+                lambda pole=pole: Database.get_role_stats(pole, days=30),
+            )
+        )
+    cases += [
+        ("/stats", lambda: LaboStats(None).load_stats(30)),
+        ("/stats_pole DEV", lambda: PoleStats(None).load_pole_stats("DEV", 30)),
+        ("/rapport", lambda: Report(None).load_report(30, "embed")),
+        ("/rapport (fichier)", lambda: Report(None).load_report(30, "file")),
+        ("/membres", members_command),
+        (
+            "/membre_info",
+            lambda: InfoMember(None).load_member_info(member.discord_id),
+        ),
+    ]
+    for type in ["membres", "reunions", "presences", "complet"]:
+        cases.append((f"/export {type}", lambda type=type: export_command(type)))
+    cases.append(
+        (
+            "AdminAttendanceView (appel complet)",
+            lambda: rolled_back(attendance_view),
+        )
+    )
+    return cases
+
+
+async def run_cases(args):
+    results = []
+    try:
+        for name, func in build_cases():
+            if args.filter and args.filter not in name:
+                continue
+            result = await measure(name, func, args.repeat)
+            results.append(result)
+            print(
+                f"{name:<45} {result['median_ms']:>10.1f} ms "
+                f"{result['queries']:>6} requêtes"
+            )
+    finally:
+        await dispose_async_engine()
+    return results
+
+
+def dataset_counts():
+    with Session() as session:
+        return {
+            "members": session.query(func.count(Member.id)).scalar(),
+            "meetings": session.query(func.count(Meeting.id)).scalar(),
+            "attendances": session.query(func.count(Attendance.id)).scalar(),
+            "tickets": session.query(func.count(Ticket.id)).scalar(),
+        }
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks hors ligne LCSP")
+    parser.add_argument(
+        "--generate", action="store_true", help="Regénérer le jeu de données"
+    )
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Confirme la suppression des tables (avec --generate)",
+    )
+    parser.add_argument("--members", type=int, default=1000)
+    parser.add_argument("--meetings", type=int, default=500)
+    parser.add_argument("--tickets", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", help="Ne lancer que les cas contenant ce texte")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="Résultats JSON précédents à comparer")
+    args = parser.parse_args(argv)
+
+    if args.generate:
+        if not args.reset:
+            print(
+                f"❌ Toutes les tables de {engine.url!r} seront vidées : "
+                "ajoutez --reset"
+            )
+            return 1
+        dataset.generate(args.members, args.meetings, args.tickets, seed=args.seed)
+
+    results = asyncio.run(run_cases(args))
+
+    report = {
+        "commit": current_commit(),
+        "date": datetime.utcnow().isoformat(),
+        "dialect": engine.dialect.name,
+        "dataset": dataset_counts(),
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"✅ Résultats écrits dans {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            previous = {r["name"]: r for r in json.load(f)["results"]}
+        print(f"\nComparaison avec {args.baseline}:")
+        for result in results:
+            before = previous.get(result["name"])
+            if not before or not before["median_ms"]:
+                continue
+            ratio = result["median_ms"] / before["median_ms"]
+            print(
+                f"{result['name']:<45} x{ratio:>5.2f} "
+                f"({before['queries']} → {result['queries']} requêtes)"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,7 +3,7 @@ from discord.ext import commands
 from discord import app_commands
 from typing import Optional
 import logging
-from database import Database
+from database import AsyncDatabase
 from .is_admin import is_admin
 
 logger = logging.getLogger(__name__)
@@ -14,7 +14,7 @@ class Clear(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
 
     # Commande de suppression de messages
     @app_commands.command(name="clear", description="Supprimer des messages")
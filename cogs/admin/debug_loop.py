@@ -0,0 +1,59 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+import logging
+from cogs.admin.is_admin import is_admin
+
+logger = logging.getLogger(__name__)
+
+
+class DebugLoop(commands.Cog):
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    # Blocages de la boucle d'évènements détectés par le watchdog
+    @app_commands.command(
+        name="debug_loop",
+        description="Voir les pires blocages de la boucle d'évènements",
+    )
+    @is_admin()
+    async def debug_loop(self, interaction: discord.Interaction):
+        watchdog = self.bot.loop_watchdog
+        worst = watchdog.worst(limit=5)
+
+        embed = discord.Embed(
+            title="🐌 Blocages de la boucle d'évènements",
+            description=f"Seuil: {watchdog.threshold * 1000:.0f} ms\n"
+            f"Retard actuel: {watchdog.last_lag * 1000:.0f} ms\n"
+            f"Pire retard depuis le démarrage: {watchdog.max_lag * 1000:.0f} ms",
+            color=discord.Color.orange() if worst else discord.Color.green(),
+            timestamp=discord.utils.utcnow(),
+        )
+
+        if not worst:
+            embed.add_field(name="✅ Aucun blocage", value="Rien à signaler")
+
+        for stall in worst:
+            value = (
+                f"**Cog:** {stall['cog'] or 'Inconnu'}\n"
+                f"**Fonction:** {stall['command'] or 'Inconnue'}\n"
+                f"**Database:** {stall['database'] or '-'}\n"
+                f"**Le:** {stall['at'].strftime('%d/%m/%Y %H:%M:%S')} UTC"
+            )
+            embed.add_field(name=f"{stall['lag_ms']:.0f} ms", value=value, inline=False)
+
+        # Pile du pire blocage
+        if worst and worst[0]["stack"]:
+            stack = "".join(worst[0]["stack"][-4:])
+            embed.add_field(
+                name="📚 Pile du pire blocage",
+                value=f"```{stack[-1000:]}```",
+                inline=False,
+            )
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+async def setup(bot):
+    await bot.add_cog(DebugLoop(bot))
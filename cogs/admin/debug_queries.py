@@ -0,0 +1,77 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+from typing import Optional
+import logging
+from config import SLOW_QUERY_MS
+from models import query_stats
+from cogs.admin.is_admin import is_admin
+
+logger = logging.getLogger(__name__)
+
+
+class DebugQueries(commands.Cog):
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    # Commandes les plus coûteuses en base depuis le démarrage
+    @app_commands.command(
+        name="debug_queries",
+        description="Voir les commandes qui font le plus de requêtes SQL",
+    )
+    @app_commands.describe(
+        tri="Trier par temps en base ou par nombre de requêtes",
+        vider="Remettre les compteurs à zéro après affichage",
+    )
+    @app_commands.choices(
+        tri=[
+            app_commands.Choice(name="Temps en base", value="max_db_time"),
+            app_commands.Choice(name="Nombre de requêtes", value="max_queries"),
+        ]
+    )
+    @is_admin()
+    async def debug_queries(
+        self,
+        interaction: discord.Interaction,
+        tri: Optional[str] = "max_db_time",
+        vider: bool = False,
+    ):
+        worst = query_stats.worst(limit=10, key=tri)
+
+        embed = discord.Embed(
+            title="🗄️ Requêtes SQL par commande",
+            description=f"Depuis le démarrage du bot (requête lente ≥ {SLOW_QUERY_MS} ms)",
+            color=discord.Color.blue(),
+            timestamp=discord.utils.utcnow(),
+        )
+
+        if not worst:
+            embed.add_field(name="Aucune donnée", value="Aucune commande exécutée")
+
+        for name, entry in worst:
+            value = (
+                f"**Appels:** {entry['calls']}\n"
+                f"**Requêtes:** {entry['queries'] / entry['calls']:.1f} en moyenne, "
+                f"{entry['max_queries']} max\n"
+                f"**Temps en base:** {entry['db_time'] / entry['calls']:.1f} ms en moyenne, "
+                f"{entry['max_db_time']:.1f} ms max"
+            )
+            if entry["slowest"]:
+                elapsed, sql = entry["slowest"]
+                value += (
+                    f"\n**Requêtes lentes:** {entry['slow_queries']}, "
+                    f"la pire en {elapsed:.0f} ms :\n`{sql[:200]}`"
+                )
+            embed.add_field(name=name, value=value[:500], inline=False)
+
+        if vider:
+            query_stats.clear()
+            embed.set_footer(text="Compteurs remis à zéro")
+            logger.info(f"🗑️ Compteurs de requêtes remis à zéro par {interaction.user}")
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+async def setup(bot):
+    await bot.add_cog(DebugQueries(bot))
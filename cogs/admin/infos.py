@@ -2,7 +2,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import logging
-from database import Database
+from database import AsyncDatabase
 from .is_admin import is_admin
 
 logger = logging.getLogger(__name__)
@@ -13,7 +13,7 @@ class Informations(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()    
+        self.db = AsyncDatabase()    
 
     # Commande d'informations sur le serveur
     @app_commands.command(name="info", description="Informations sur le serveur")
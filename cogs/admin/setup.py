@@ -1,14 +1,14 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from database import Database
+from database import AsyncDatabase
 from .is_admin import is_admin
 
 class Setup(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
 
     # Initialise le serveur LCSP
     @app_commands.command(name="setup", description="Initialiser le serveur LCSP")
@@ -2,7 +2,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import logging
-from database import Database
+from database import AsyncDatabase
 from cogs.admin.is_admin import is_admin
 from views.createAttendance import create_attendance_view
 
@@ -14,7 +14,7 @@ class Appel(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
 
     # Lancer l'appel pour une réunion par nom
     @app_commands.command(
@@ -26,7 +26,7 @@ class Appel(commands.Cog):
         await interaction.response.defer()
 
         # Rechercher la réunion par nom
-        meetings = self.db.get_meeting_by_name(reunion)
+        meetings = await self.db.get_meeting_by_name(reunion)
 
         if not meetings:
             await interaction.followup.send(
@@ -62,7 +62,7 @@ class Appel(commands.Cog):
             return
 
         # Créer la vue Admin pour gérer l'appel
-        await create_attendance_view(interaction, meeting)
+        await create_attendance_view(self, interaction, meeting)
 
         logger.info(
             f"📝 Appel lancé pour la réunion '{meeting.title}' (ID: {meeting.id}) par {interaction.user} (ID: {interaction.user.id})"
@@ -2,7 +2,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import logging
-from database import Database
+from database import AsyncDatabase
 from cogs.admin.is_admin import is_admin
 from views.createAttendance import create_attendance_view
 
@@ -13,7 +13,7 @@ class AppelID(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
 
     # Lancer l'appel pour une réunion par ID
     @app_commands.command(
@@ -26,7 +26,7 @@ class AppelID(commands.Cog):
     ):
         await interaction.response.defer()
 
-        meeting = self.db.get_meeting(meeting_id)
+        meeting = await self.db.get_meeting(meeting_id)
         if not meeting:
             await interaction.followup.send("❌ Réunion introuvable")
             return
@@ -38,7 +38,7 @@ class AppelID(commands.Cog):
             return
 
         # Créer la vue Admin pour gérer l'appel
-        await self.create_attendance_view(interaction, meeting)
+        await create_attendance_view(self, interaction, meeting)
 
         logger.info(
             f"🟢 Appel lancé pour la réunion ID {meeting_id} par {interaction.user} ({interaction.user.id})"
@@ -4,7 +4,7 @@ from discord import app_commands
 from typing import Optional
 from datetime import datetime
 import logging
-from database import Database
+from database import AsyncDatabase
 from cogs.admin.is_admin import is_admin
 
 logger = logging.getLogger(__name__)
@@ -15,7 +15,7 @@ class CreateMeeting(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
 
     # Création d'une réunion
     @app_commands.command(name="meeting_create", description="Créer une réunion")
@@ -67,7 +67,7 @@ class CreateMeeting(commands.Cog):
                     return
 
         # Récupérer l'organisateur
-        organizer = self.db.get_member(str(interaction.user.id))
+        organizer = await self.db.get_member(str(interaction.user.id))
         if not organizer:
             await interaction.followup.send(
                 "❌ Vous devez être enregistré comme membre pour créer une réunion"
@@ -75,7 +75,7 @@ class CreateMeeting(commands.Cog):
             return
 
         # Créer la réunion
-        meeting = self.db.create_meeting(
+        meeting = await self.db.create_meeting(
             title=titre,
             date=meeting_date,
             description=description,
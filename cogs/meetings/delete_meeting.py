@@ -2,7 +2,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import logging
-from database import Database
+from database import AsyncDatabase
 from cogs.admin.is_admin import is_admin
 
 logger = logging.getLogger(__name__)
@@ -12,7 +12,7 @@ class DeleteMeeting(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
 
     # Commande pour supprimer un meeting par le nom
     @app_commands.command(
@@ -23,7 +23,7 @@ class DeleteMeeting(commands.Cog):
     async def delete_meeting(self, interaction: discord.Interaction, reunion: str):
         await interaction.response.defer()
 
-        if self.db.delete_meeting(str(reunion)):
+        if await self.db.delete_meeting(str(reunion)):
             await interaction.followup.send(f"✅ Réunion '{reunion}' supprimée")
         else:
             await interaction.followup.send(f"❌ Meeting non trouvé", ephemeral=True)
@@ -2,7 +2,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import logging
-from database import Database
+from database import AsyncDatabase
 from cogs.admin.is_admin import is_admin
 
 logger = logging.getLogger(__name__)
@@ -12,7 +12,7 @@ class DeleteMeetingID(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
 
     # Commande pour supprimer un meeting par le nom
     @app_commands.command(
@@ -25,13 +25,13 @@ class DeleteMeetingID(commands.Cog):
     ):
         await interaction.response.defer()
 
-        meeting = self.db.get_meeting(meeting_id)
+        meeting = await self.db.get_meeting(meeting_id)
         if not meeting:
             await interaction.followup.send("❌ Réunion introuvable")
             return
 
         # Supprime la réunion
-        await self.delete_meeting_id(meeting_id)
+        await self.db.delete_meeting_id(meeting_id)
 
         await interaction.followup.send(f"✅ Réunion avec ID {meeting_id} supprimée")
 
@@ -3,7 +3,8 @@ from discord.ext import commands
 from discord import app_commands
 from typing import Optional
 import logging
-from database import Database
+from database import AsyncDatabase
+from models import Meeting
 
 logger = logging.getLogger(__name__)
 
@@ -12,7 +13,7 @@ class Meetings(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
 
     # Afficher les prochaines réunions
     @app_commands.command(
@@ -24,7 +25,7 @@ class Meetings(commands.Cog):
     ):
         await interaction.response.defer()
 
-        meetings = self.db.get_upcoming_meetings(
+        meetings = await self.db.get_upcoming_meetings(
             limit=10, role=pole.upper() if pole else None
         )
 
@@ -45,7 +46,7 @@ class Meetings(commands.Cog):
         )
 
         for meeting in meetings:
-            target_roles = meeting.get_target_roles()
+            target_roles = Meeting.parse_target_roles(meeting.target_roles)
             roles_text = "Tous" if "ALL" in target_roles else ", ".join(target_roles)
 
             field_value = f"📅 {meeting.date.strftime('%d/%m/%Y à %H:%M')}\n"
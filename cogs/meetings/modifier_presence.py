@@ -2,7 +2,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import logging
-from database import Database
+from database import AsyncDatabase
 from cogs.admin.is_admin import is_admin
 
 logger = logging.getLogger(__name__)
@@ -12,7 +12,7 @@ class ModifyPresence(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
 
     # Modifier la présence par nom de réunion
     @app_commands.command(
@@ -34,7 +34,7 @@ class ModifyPresence(commands.Cog):
         await interaction.response.defer(ephemeral=True)
 
         # Rechercher la réunion
-        meetings = self.db.get_meeting_by_name(reunion)
+        meetings = await self.db.get_meeting_by_name(reunion)
 
         if not meetings:
             await interaction.followup.send(
@@ -66,7 +66,7 @@ class ModifyPresence(commands.Cog):
             )
             return
 
-        member = self.db.get_member(str(membre.id))
+        member = await self.db.get_member(str(membre.id))
         if not member:
             await interaction.followup.send("❌ Membre non enregistré", ephemeral=True)
             return
@@ -79,7 +79,7 @@ class ModifyPresence(commands.Cog):
             )
             return
 
-        self.db.record_attendance(
+        await self.db.record_attendance(
             meeting.id, member.id, statut, modified_by=str(interaction.user.id)
         )
 
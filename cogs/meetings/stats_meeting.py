@@ -2,7 +2,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import logging
-from database import Database
+from database import AsyncDatabase
 
 logger = logging.getLogger(__name__)
 
@@ -11,7 +11,7 @@ class MeetingStats(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
 
     # Statistiques d'une réunion par nom
     @app_commands.command(
@@ -22,7 +22,7 @@ class MeetingStats(commands.Cog):
     async def meeting_stats(self, interaction: discord.Interaction, reunion: str):
         await interaction.response.defer()
 
-        meetings = self.db.get_meeting_by_name(reunion)
+        meetings = await self.db.get_meeting_by_name(reunion)
         if not meetings:
             await interaction.followup.send(
                 f"❌ Aucune réunion trouvée avec le nom '{reunion}'", ephemeral=True
@@ -47,7 +47,7 @@ class MeetingStats(commands.Cog):
             return
 
         meeting = meetings[0]
-        stats = self.db.get_meeting_stats(meeting.id)
+        stats = await self.db.get_meeting_stats(meeting.id)
         if not stats:
             await interaction.followup.send("❌ Réunion introuvable", ephemeral=True)
             return
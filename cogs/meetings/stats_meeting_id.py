@@ -2,7 +2,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import logging
-from database import Database
+from database import AsyncDatabase
 
 logger = logging.getLogger(__name__)
 
@@ -11,7 +11,7 @@ class MeetingStatsID(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
 
     # Statistiques d'une réunion par ID
     @app_commands.command(
@@ -22,7 +22,7 @@ class MeetingStatsID(commands.Cog):
     async def meeting_stats_id(self, interaction: discord.Interaction, meeting_id: int):
         await interaction.response.defer()
 
-        stats = self.db.get_meeting_stats(meeting_id)
+        stats = await self.db.get_meeting_stats(meeting_id)
         if not stats:
             await interaction.followup.send("❌ Réunion introuvable", ephemeral=True)
             return
@@ -3,7 +3,7 @@ from discord.ext import commands
 from discord import app_commands
 from typing import Optional
 import logging
-from database import Database
+from database import AsyncDatabase
 from cogs.admin.is_admin import is_admin
 
 logger = logging.getLogger(__name__)
@@ -13,7 +13,7 @@ class UpdateMeeting(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
         self.active_meetings = {}
 
     # Commande pour modifier une réunion par le nom
@@ -41,7 +41,7 @@ class UpdateMeeting(commands.Cog):
     ):
         await interaction.response.defer()
 
-        if self.db.update_meeting_by_name(
+        if await self.db.update_meeting_by_name(
             reunion, titre, date, heure, roles, description
         ):
             await interaction.followup.send(f"✅ Réunion '{reunion}' modifiée")
@@ -3,7 +3,7 @@ from discord.ext import commands
 from discord import app_commands
 from typing import Optional, List
 import logging
-from database import Database
+from database import AsyncDatabase
 from cogs.admin.is_admin import is_admin
 
 logger = logging.getLogger(__name__)
@@ -13,7 +13,7 @@ class UpdateMeetingID(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
         
     # Commande pour modifier une réunion par ID
     @app_commands.command(
@@ -40,12 +40,12 @@ class UpdateMeetingID(commands.Cog):
     ):
         await interaction.response.defer()
 
-        meeting = self.db.get_meeting(meeting_id)
+        meeting = await self.db.get_meeting(meeting_id)
         if not meeting:
             await interaction.followup.send("❌ Réunion introuvable", ephemeral=True)
             return
 
-        if self.db.update_meeting_by_id(
+        if await self.db.update_meeting_by_id(
             meeting_id, titre, date, heure, roles, description
         ):
             await interaction.followup.send(f"✅ Réunion ID '{meeting_id}' modifiée")
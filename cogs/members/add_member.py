@@ -3,7 +3,7 @@ from discord.ext import commands
 from discord import app_commands
 from typing import Optional
 import logging
-from database import Database
+from database import AsyncDatabase
 from cogs.admin.is_admin import is_admin
 
 logger = logging.getLogger(__name__)
@@ -13,7 +13,7 @@ class AddMember(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
 
     # Ajouter un membre
     @app_commands.command(name="membre_add", description="Ajouter un membre")
@@ -37,7 +37,7 @@ class AddMember(commands.Cog):
         await interaction.response.defer()
 
         # Vérifier si le membre existe
-        if self.db.get_member(str(user.id)):
+        if await self.db.get_member(str(user.id)):
             await interaction.followup.send(f"❌ {user.mention} est déjà enregistré")
             return
 
@@ -54,7 +54,7 @@ class AddMember(commands.Cog):
         # Si pole est None, on continue sans erreur
 
         # Ajouter le membre
-        member = self.db.add_member(
+        member = await self.db.add_member(
             discord_id=str(user.id),
             username=user.name,
             full_name=nom,
@@ -2,7 +2,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import logging
-from database import Database
+from database import AsyncDatabase
 from cogs.admin.is_admin import is_admin
 
 logger = logging.getLogger(__name__)
@@ -12,7 +12,7 @@ class DeleteMember(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
 
     # Supprimer un membre
     @app_commands.command(name="membre_delete", description="Supprimer un membre")
@@ -23,7 +23,7 @@ class DeleteMember(commands.Cog):
     ):
         await interaction.response.defer(ephemeral=True)
 
-        if self.db.delete_member(str(user.id)):
+        if await self.db.delete_member(str(user.id)):
             # Retirer les rôles de pôle
             for role_name in ["DEV", "IA", "INFRA"]:
                 role = discord.utils.get(interaction.guild.roles, name=role_name)
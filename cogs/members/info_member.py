@@ -3,7 +3,7 @@ from discord.ext import commands
 from discord import app_commands
 from typing import Optional
 import logging
-from database import Database
+from database import AsyncDatabase, unit_of_work
 
 logger = logging.getLogger(__name__)
 
@@ -12,7 +12,23 @@ class InfoMember(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
+
+    # Données de la fiche d'un membre (aussi appelé par benchmarks/run.py)
+    # Retourne (membre, stats, réunions à venir) ; (None, None, None) si inconnu
+    async def load_member_info(self, discord_id):
+        # Une seule session pour toutes les lectures de la fiche
+        async with unit_of_work():
+            member = await self.db.get_member(discord_id)
+            if not member:
+                return None, None, None
+
+            # Calculer les stats
+            stats = await self.db.get_member_stats(member.id)
+
+            # Récupérer les réunions à venir
+            upcoming_meetings = await self.db.get_member_upcoming_meetings(member.id)
+        return member, stats, upcoming_meetings
 
 # Voir les informations d'un membre
     @app_commands.command(
@@ -27,18 +43,13 @@ class InfoMember(commands.Cog):
         await interaction.response.defer()
 
         target = user or interaction.user
-        member = self.db.get_member(str(target.id))
+
+        member, stats, upcoming_meetings = await self.load_member_info(str(target.id))
 
         if not member:
             await interaction.followup.send(f"❌ {target.mention} n'est pas enregistré")
             return
 
-        # Calculer les stats
-        stats = self.db.get_member_stats(member.id)
-
-        # Récupérer les réunions à venir
-        upcoming_meetings = self.db.get_member_upcoming_meetings(member.id)
-
         # Créer l'embed
         embed = discord.Embed(title=f"👤 Fiche membre LCSP", color=discord.Color.blue())
         embed.set_thumbnail(url=target.display_avatar.url)
@@ -2,8 +2,9 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from typing import Optional
+import functools
 import logging
-from database import Database
+from database import AsyncDatabase
 from models import MemberStatus
 from views.memberListView import MemberListView
 
@@ -15,7 +16,7 @@ class ListMember(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
 
     # Lister les membres
     @app_commands.command(
@@ -46,10 +47,11 @@ class ListMember(commands.Cog):
 
         role_filter = pole.upper() if pole else None
 
-        # Récupérer les membres
-        members = self.db.get_all_members(status=status_filter, role=role_filter)
+        page_count, render_page = await self.prepare_pages(
+            status_filter, role_filter, pole, statut
+        )
 
-        if not members:
+        if not page_count:
             msg = "Aucun membre trouvé"
             if pole:
                 msg += f" dans le pôle {pole.upper()}"
@@ -58,87 +60,121 @@ class ListMember(commands.Cog):
             await interaction.followup.send(msg)
             return
 
-        # Créer plusieurs embeds si nécessaire (max 10 membres par embed pour la lisibilité)
-        embeds = []
-        members_per_page = 10
-
-        for i in range(0, len(members), members_per_page):
-            page_members = members[i : i + members_per_page]
-
-            # Titre de l'embed
-            title = f"👥 Membres LCSP"
-            if pole:
-                title += f" - Pôle {pole.upper()}"
-            if statut:
-                title += f" - {statut.capitalize()}"
+        first_embed = await render_page(0)
 
-            embed = discord.Embed(
-                title=title,
-                description=f"Page {i//members_per_page + 1}/{(len(members)-1)//members_per_page + 1}",
-                color=discord.Color.blue(),
-            )
-
-            # Créer le tableau
-            # En-tête du tableau
-            table = "```\n"
-            table += f"{'Nom':<20} {'Pôle':<8} {'Statut':<10} {'Présence':<10}\n"
-            table += "-" * 50 + "\n"
+        # Si une seule page, envoyer directement
+        if page_count == 1:
+            await interaction.followup.send(embed=first_embed)
+        else:
+            # Créer une vue avec pagination (pages suivantes construites à la demande)
+            view = MemberListView(render_page, page_count, first_embed=first_embed)
+            await interaction.followup.send(embed=first_embed, view=view)
+        
+        logger.info(f"👥 Liste des membres affichée par {interaction.user} (pôle={pole}, statut={statut})")
 
-            for member in page_members:
-                # Récupérer les stats de présence
-                stats = self.db.get_member_stats(member.id, days=30)
+    # Nombre de pages de la liste et fournisseur de pages (page -> embed)
+    # (aussi appelé par benchmarks/run.py) ; (0, None) si aucun membre
+    async def prepare_pages(self, status_filter, role_filter, pole, statut):
+        # Compter les membres (une requête groupée), sans les charger
+        overview = await self.db.get_members_overview(
+            status=status_filter, role=role_filter
+        )
+        if not overview["total"]:
+            return 0, None
+
+        # Max 10 membres par embed pour la lisibilité
+        members_per_page = 10
+        page_count = (overview["total"] - 1) // members_per_page + 1
+
+        render_page = functools.partial(
+            self.build_page,
+            page_count=page_count,
+            members_per_page=members_per_page,
+            overview=overview,
+            status_filter=status_filter,
+            role_filter=role_filter,
+            pole=pole,
+            statut=statut,
+        )
+        return page_count, render_page
+
+    # Construire l'embed d'une page de la liste des membres
+    async def build_page(
+        self,
+        page,
+        page_count,
+        members_per_page,
+        overview,
+        status_filter,
+        role_filter,
+        pole,
+        statut,
+    ):
+        page_members = await self.db.get_members_page(
+            page * members_per_page,
+            members_per_page,
+            status=status_filter,
+            role=role_filter,
+        )
+
+        # Stats de présence des membres de la page en une seule requête
+        all_stats = await self.db.get_members_stats(
+            [m.id for m in page_members], days=30
+        )
+
+        # Titre de l'embed
+        title = f"👥 Membres LCSP"
+        if pole:
+            title += f" - Pôle {pole.upper()}"
+        if statut:
+            title += f" - {statut.capitalize()}"
 
-                # Tronquer le nom si trop long
-                name = (member.full_name or member.username)[:19]
-                pole_str = (member.role or "N/A")[:7]
-                status_str = member.status.value[:9]
-                presence = f"{stats['rate']:.0f}%"
+        embed = discord.Embed(
+            title=title,
+            description=f"Page {page + 1}/{page_count}",
+            color=discord.Color.blue(),
+        )
 
-                table += f"{name:<20} {pole_str:<8} {status_str:<10} {presence:<10}\n"
+        # Créer le tableau
+        # En-tête du tableau
+        table = "```\n"
+        table += f"{'Nom':<20} {'Pôle':<8} {'Statut':<10} {'Présence':<10}\n"
+        table += "-" * 50 + "\n"
 
-            table += "```"
+        for member in page_members:
+            # Récupérer les stats de présence
+            stats = all_stats[member.id]
 
-            embed.add_field(name="📊 Tableau des membres", value=table, inline=False)
+            # Tronquer le nom si trop long
+            name = (member.full_name or member.username)[:19]
+            pole_str = (member.role or "N/A")[:7]
+            status_str = member.status.value[:9]
+            presence = f"{stats['rate']:.0f}%"
 
-            # Statistiques en bas
-            if i == 0:  # Seulement sur la première page
-                # Compter par pôle
-                poles_count = {}
-                for m in members:
-                    if m.role:
-                        poles_count[m.role] = poles_count.get(m.role, 0) + 1
+            table += f"{name:<20} {pole_str:<8} {status_str:<10} {presence:<10}\n"
 
-                stats_text = f"**Total:** {len(members)} membres\n"
-                for pole_name, count in poles_count.items():
-                    stats_text += f"**{pole_name}:** {count}\n"
+        table += "```"
 
-                embed.add_field(name="📈 Répartition", value=stats_text, inline=True)
+        embed.add_field(name="📊 Tableau des membres", value=table, inline=False)
 
-                # Compter par statut
-                status_count = {}
-                for m in members:
-                    status_count[m.status.value] = (
-                        status_count.get(m.status.value, 0) + 1
-                    )
+        # Statistiques en bas
+        if page == 0:  # Seulement sur la première page
+            # Compter par pôle
+            stats_text = f"**Total:** {overview['total']} membres\n"
+            for pole_name, count in overview["roles"].items():
+                stats_text += f"**{pole_name}:** {count}\n"
 
-                status_text = ""
-                for status_name, count in status_count.items():
-                    status_text += f"**{status_name.capitalize()}:** {count}\n"
+            embed.add_field(name="📈 Répartition", value=stats_text, inline=True)
 
-                embed.add_field(name="📋 Statuts", value=status_text, inline=True)
+            # Compter par statut
+            status_text = ""
+            for status_name, count in overview["statuses"].items():
+                status_text += f"**{status_name.capitalize()}:** {count}\n"
 
-            embed.set_footer(text=f"Laboratoire de Cybersécurité SUPINFO Paris")
-            embeds.append(embed)
+            embed.add_field(name="📋 Statuts", value=status_text, inline=True)
 
-        # Si une seule page, envoyer directement
-        if len(embeds) == 1:
-            await interaction.followup.send(embed=embeds[0])
-        else:
-            # Créer une vue avec pagination
-            view = MemberListView(embeds)
-            await interaction.followup.send(embed=embeds[0], view=view)
-        
-        logger.info(f"👥 Liste des membres affichée par {interaction.user} (pôle={pole}, statut={statut})")
+        embed.set_footer(text=f"Laboratoire de Cybersécurité SUPINFO Paris")
+        return embed
 
 async def setup(bot):
     await bot.add_cog(ListMember(bot))
\ No newline at end of file
@@ -2,7 +2,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import logging
-from database import Database
+from database import AsyncDatabase
 
 logger = logging.getLogger(__name__)
 
@@ -10,7 +10,7 @@ class ResearchMember(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
 
     # Rechercher un membre
     @app_commands.command(name="membre_search", description="Rechercher un membre")
@@ -18,18 +18,8 @@ class ResearchMember(commands.Cog):
     async def search_member(self, interaction: discord.Interaction, recherche: str):
         await interaction.response.defer()
 
-        members = self.db.get_all_members()
-
-        # Filtrer les membres
-        results = []
-        search_lower = recherche.lower()
-        for member in members:
-            if (
-                search_lower in (member.full_name or "").lower()
-                or search_lower in member.username.lower()
-                or search_lower in (member.email or "").lower()
-            ):
-                results.append(member)
+        # Un résultat de plus que l'affichage pour savoir s'il en reste d'autres
+        results = await self.db.search_members(recherche, limit=11)
 
         if not results:
             await interaction.followup.send(
@@ -40,7 +30,8 @@ class ResearchMember(commands.Cog):
         # Créer l'embed des résultats
         embed = discord.Embed(
             title=f"🔍 Résultats de recherche",
-            description=f"Recherche: **{recherche}**\n{len(results)} résultat(s)",
+            description=f"Recherche: **{recherche}**\n"
+            f"{min(len(results), 10)}{'+' if len(results) > 10 else ''} résultat(s)",
             color=discord.Color.blue(),
         )
 
@@ -60,7 +51,7 @@ class ResearchMember(commands.Cog):
             )
 
         if len(results) > 10:
-            embed.set_footer(text=f"... et {len(results) - 10} autres résultats")
+            embed.set_footer(text="... et d'autres résultats, précisez la recherche")
 
         await interaction.followup.send(embed=embed)
 
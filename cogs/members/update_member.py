@@ -3,7 +3,7 @@ from discord.ext import commands
 from discord import app_commands
 from typing import Optional
 import logging
-from database import Database
+from database import AsyncDatabase
 from models import MemberStatus
 from cogs.admin.is_admin import is_admin
 
@@ -14,7 +14,7 @@ class UpdateMember(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
 
     # Mettre à jour un membre
     @app_commands.command(name="membre_update", description="Modifier un membre")
@@ -74,7 +74,7 @@ class UpdateMember(commands.Cog):
             )
             return
 
-        member = self.db.update_member(str(user.id), **updates)
+        member = await self.db.update_member(str(user.id), **updates)
 
         if member:
             # Mettre à jour le rôle Discord si nécessaire
@@ -0,0 +1,39 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+import logging
+from database import AsyncDatabase
+from cogs.admin.is_admin import is_admin
+
+logger = logging.getLogger(__name__)
+
+
+class RebuildStats(commands.Cog):
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.db = AsyncDatabase()
+
+    # Reconstruit le résumé des présences utilisé par les statistiques
+    @app_commands.command(
+        name="stats_rebuild",
+        description="Recalculer le résumé des présences à partir de l'historique",
+    )
+    @is_admin()
+    async def stats_rebuild(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True)
+
+        rows = await self.db.rebuild_attendance_summary()
+
+        await interaction.followup.send(
+            f"✅ Résumé des présences reconstruit ({rows} ligne(s))", ephemeral=True
+        )
+
+        # Log de l'action
+        logger.info(
+            f"🔄 Résumé des présences reconstruit par {interaction.user} ({rows} lignes)"
+        )
+
+
+async def setup(bot):
+    await bot.add_cog(RebuildStats(bot))
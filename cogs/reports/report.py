@@ -6,7 +6,7 @@ from datetime import datetime, timedelta
 import logging
 import io
 import csv
-from database import Database
+from database import AsyncDatabase
 from models import MemberStatus
 
 logger = logging.getLogger(__name__)
@@ -15,7 +15,23 @@ class Report(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
+
+    # Données de /rapport (aussi appelé par benchmarks/run.py)
+    # Retourne (stats globales, membres actifs, détails) : les stats de chaque
+    # membre pour le format fichier, celles de chaque pôle pour l'embed
+    async def load_report(self, jours, format):
+        global_stats = await self.db.get_global_stats(days=jours)
+        members = await self.db.get_all_members(status=MemberStatus.ACTIVE)
+        if format == "file":
+            details = await self.db.get_members_stats(
+                [m.id for m in members], days=jours
+            )
+        else:
+            details = {}
+            for pole in ["DEV", "IA", "INFRA"]:
+                details[pole] = await self.db.get_role_stats(pole, days=jours)
+        return global_stats, members, details
 
     # Rapport d'activité complet
     @app_commands.command(name="rapport", description="Rapport d'activité détaillé")
@@ -32,8 +48,7 @@ class Report(commands.Cog):
         await interaction.response.defer()
 
         # Récupérer toutes les données
-        global_stats = self.db.get_global_stats(days=jours)
-        members = self.db.get_all_members(status=MemberStatus.ACTIVE)
+        global_stats, members, details = await self.load_report(jours, format)
 
         if format == "file":
             # Générer un rapport CSV
@@ -59,7 +74,7 @@ class Report(commands.Cog):
 
             # Données
             for member in members:
-                stats = self.db.get_member_stats(member.id, days=jours)
+                stats = details[member.id]
                 writer.writerow(
                     [
                         member.full_name or "",
@@ -108,8 +123,7 @@ class Report(commands.Cog):
 
             # Analyse par pôle
             poles_analysis = ""
-            for pole in ["DEV", "IA", "INFRA"]:
-                pole_stats = self.db.get_role_stats(pole, days=jours)
+            for pole, pole_stats in details.items():
                 if pole_stats["members_count"] > 0:
                     trend = (
                         "📈"
@@ -170,5 +184,6 @@ class Report(commands.Cog):
 
             logger.info(f"📊 Rapport d'activité généré par {interaction.user} pour {jours} jours")
 
+
 async def setup(bot):
     await bot.add_cog(Report(bot))
\ No newline at end of file
@@ -0,0 +1,53 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+import logging
+from database import stats_cache
+from cogs.admin.is_admin import is_admin
+
+logger = logging.getLogger(__name__)
+
+
+class StatsCacheInfo(commands.Cog):
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    # Efficacité du cache des statistiques
+    @app_commands.command(
+        name="stats_cache", description="Voir l'efficacité du cache des statistiques"
+    )
+    @app_commands.describe(vider="Vider le cache après affichage")
+    @is_admin()
+    async def stats_cache(self, interaction: discord.Interaction, vider: bool = False):
+        info = stats_cache.info()
+
+        embed = discord.Embed(
+            title="🗃️ Cache des statistiques",
+            color=discord.Color.blue(),
+            timestamp=discord.utils.utcnow(),
+        )
+        embed.add_field(
+            name="Requêtes",
+            value=f"**Hits:** {info['hits']}\n"
+            f"**Misses:** {info['misses']}\n"
+            f"**Taux de hit:** {info['hit_rate']:.1f}%",
+            inline=True,
+        )
+        embed.add_field(
+            name="Contenu",
+            value=f"**Entrées:** {info['size']}/{info['maxsize']}\n"
+            f"**Durée de vie:** {info['ttl']}s",
+            inline=True,
+        )
+
+        if vider:
+            stats_cache.clear()
+            embed.set_footer(text="Cache vidé")
+            logger.info(f"🗑️ Cache des statistiques vidé par {interaction.user}")
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+async def setup(bot):
+    await bot.add_cog(StatsCacheInfo(bot))
@@ -3,7 +3,7 @@ from discord.ext import commands
 from discord import app_commands
 import logging
 from typing import Optional
-from database import Database
+from database import AsyncDatabase, unit_of_work
 from models import MemberStatus
 
 logger = logging.getLogger(__name__)
@@ -12,7 +12,26 @@ class LaboStats(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
+
+    # Données de /stats (aussi appelé par benchmarks/run.py)
+    async def load_stats(self, jours):
+        # Toutes les lectures dans une seule session
+        async with unit_of_work():
+            # Récupérer les stats globales
+            global_stats = await self.db.get_global_stats(days=jours)
+
+            # Récupérer les données par pôle
+            poles = ["DEV", "IA", "INFRA"]
+            pole_stats = {}
+            for pole in poles:
+                pole_stats[pole] = await self.db.get_role_stats(pole, days=jours)
+
+            all_members = await self.db.get_all_members(status=MemberStatus.ACTIVE)
+            all_stats = await self.db.get_members_stats(
+                [m.id for m in all_members], days=jours
+            )
+        return global_stats, pole_stats, all_members, all_stats
 
     # Statistiques générales
     @app_commands.command(name="stats", description="Statistiques générales du LCSP")
@@ -20,14 +39,9 @@ class LaboStats(commands.Cog):
     async def stats(self, interaction: discord.Interaction, jours: Optional[int] = 30):
         await interaction.response.defer()
 
-        # Récupérer les stats globales
-        global_stats = self.db.get_global_stats(days=jours)
-
-        # Récupérer les données par pôle
-        poles = ["DEV", "IA", "INFRA"]
-        pole_stats = {}
-        for pole in poles:
-            pole_stats[pole] = self.db.get_role_stats(pole, days=jours)
+        global_stats, pole_stats, all_members, all_stats = await self.load_stats(
+            jours
+        )
 
         # Créer l'embed principal
         embed = discord.Embed(
@@ -63,11 +77,10 @@ class LaboStats(commands.Cog):
             embed.add_field(name=f"{icon} Pôle {pole}", value=value, inline=True)
 
         # Top membres global (tous pôles confondus)
-        all_members = self.db.get_all_members(status=MemberStatus.ACTIVE)
         member_rates = []
 
         for member in all_members:
-            stats = self.db.get_member_stats(member.id, days=jours)
+            stats = all_stats[member.id]
             if stats["total"] > 0:  # Seulement ceux qui ont eu des réunions
                 member_rates.append(
                     {
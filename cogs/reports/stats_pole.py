@@ -3,7 +3,7 @@ from discord.ext import commands
 from discord import app_commands
 import logging
 from typing import Optional
-from database import Database
+from database import AsyncDatabase, unit_of_work
 from models import MemberStatus
 
 logger = logging.getLogger(__name__)
@@ -13,7 +13,24 @@ class PoleStats(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
+
+    # Données de /stats_pole (aussi appelé par benchmarks/run.py)
+    async def load_pole_stats(self, pole, jours):
+        # Toutes les lectures dans une seule session
+        async with unit_of_work():
+            # Récupérer les stats du pôle
+            stats = await self.db.get_role_stats(pole, days=jours)
+            members = await self.db.get_all_members(
+                role=pole, status=MemberStatus.ACTIVE
+            )
+            all_stats = (
+                await self.db.get_members_stats([m.id for m in members], days=jours)
+                if members
+                else {}
+            )
+            upcoming = await self.db.get_upcoming_meetings(limit=3, role=pole)
+        return stats, members, all_stats, upcoming
 
     # Statistiques par pôle
     @app_commands.command(
@@ -38,8 +55,7 @@ class PoleStats(commands.Cog):
             )
             return
 
-        # Récupérer les stats du pôle
-        stats = self.db.get_role_stats(pole, days=jours)
+        stats, members, all_stats, upcoming = await self.load_pole_stats(pole, jours)
 
         # Icônes et couleurs
         config = {
@@ -93,11 +109,10 @@ class PoleStats(commands.Cog):
             embed.add_field(name="🏆 Top membres du pôle", value=top_text, inline=False)
 
         # Liste complète des membres
-        members = self.db.get_all_members(role=pole, status=MemberStatus.ACTIVE)
         if members:
             members_list = []
             for member in members:
-                member_stats = self.db.get_member_stats(member.id, days=jours)
+                member_stats = all_stats[member.id]
                 status_icon = (
                     "✅"
                     if member_stats["rate"] >= 70
@@ -128,7 +143,6 @@ class PoleStats(commands.Cog):
                 )
 
         # Prochaines réunions du pôle
-        upcoming = self.db.get_upcoming_meetings(limit=3, role=pole)
         if upcoming:
             meetings_text = ""
             for meeting in upcoming:
@@ -3,7 +3,7 @@ from discord.ext import commands
 from discord import app_commands
 from typing import Optional
 import logging
-from database import Database
+from database import AsyncDatabase
 from cogs.admin.is_admin import is_admin
 
 logger = logging.getLogger(__name__)
@@ -12,7 +12,7 @@ logger = logging.getLogger(__name__)
 class TicketClose(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
 
     @app_commands.command(
         name="ticket_close", description="Fermer un ticket par son ID"
@@ -28,15 +28,14 @@ class TicketClose(commands.Cog):
         raison: Optional[str] = None,
     ):
         await interaction.response.defer()
-        tickets = self.db.get_open_tickets()
-        ticket = next((t for t in tickets if t.id == ticket_id), None)
+        # Une seule requête : si deux admins ferment en même temps, un seul réussit
+        ticket = await self.db.close_ticket_by_id(ticket_id, str(interaction.user.id))
         if not ticket:
             await interaction.followup.send(
                 f"❌ Ticket #{ticket_id} introuvable ou déjà fermé."
             )
             return
         channel = interaction.guild.get_channel(int(ticket.channel_id))
-        self.db.close_ticket(ticket.channel_id, str(interaction.user.id))
         if channel:
             embed = discord.Embed(
                 title="🔒 Ticket fermé par un administrateur",
@@ -56,7 +55,7 @@ class TicketClose(commands.Cog):
             except:
                 pass
         await interaction.followup.send(f"✅ Ticket #{ticket_id} fermé avec succès.")
-        settings = self.db.get_ticket_settings(str(interaction.guild.id))
+        settings = await self.db.get_ticket_settings(str(interaction.guild.id))
         if settings.log_channel_id:
             log_channel = interaction.guild.get_channel(int(settings.log_channel_id))
             if log_channel:
@@ -3,7 +3,7 @@ from discord.ext import commands
 from discord import app_commands
 from typing import Optional
 import logging
-from database import Database
+from database import AsyncDatabase
 from cogs.admin.is_admin import is_admin
 
 logger = logging.getLogger(__name__)
@@ -12,7 +12,7 @@ logger = logging.getLogger(__name__)
 class TicketConfig(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
 
     @app_commands.command(
         name="ticket_config", description="Configurer le système de tickets"
@@ -35,7 +35,7 @@ class TicketConfig(commands.Cog):
         await interaction.response.defer(ephemeral=True)
 
         # Récupérer les paramètres actuels
-        settings = self.db.get_ticket_settings(str(interaction.guild.id))
+        settings = await self.db.get_ticket_settings(str(interaction.guild.id))
 
         # Préparer les mises à jour
         updates = {}
@@ -61,7 +61,7 @@ class TicketConfig(commands.Cog):
 
         # Appliquer les mises à jour
         if updates:
-            self.db.update_ticket_settings(str(interaction.guild.id), **updates)
+            await self.db.update_ticket_settings(str(interaction.guild.id), **updates)
             embed = discord.Embed(
                 title="⚙️ Configuration des tickets mise à jour",
                 description="\n".join(changes),
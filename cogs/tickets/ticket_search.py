@@ -3,7 +3,7 @@ from discord.ext import commands
 from discord import app_commands
 from typing import Optional
 import logging
-from database import Database, get_session
+from database import AsyncDatabase
 from cogs.admin.is_admin import is_admin
 
 logger = logging.getLogger(__name__)
@@ -12,7 +12,7 @@ logger = logging.getLogger(__name__)
 class TicketSearch(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
 
     @app_commands.command(
         name="ticket_search", description="Rechercher des tickets par utilisateur ou ID"
@@ -31,17 +31,11 @@ class TicketSearch(commands.Cog):
         inclure_fermes: Optional[bool] = False,
     ):
         await interaction.response.defer(ephemeral=True)
-        from models import Ticket, TicketStatus
-
-        with get_session() as session:
-            query = session.query(Ticket)
-            if utilisateur:
-                query = query.filter(Ticket.discord_user_id == str(utilisateur.id))
-            if ticket_id:
-                query = query.filter(Ticket.id == ticket_id)
-            if not inclure_fermes:
-                query = query.filter(Ticket.status != TicketStatus.CLOSED)
-            tickets = query.order_by(Ticket.created_at.desc()).all()
+        tickets = await self.db.search_tickets(
+            discord_user_id=str(utilisateur.id) if utilisateur else None,
+            ticket_id=ticket_id,
+            include_closed=inclure_fermes,
+        )
         if not tickets:
             await interaction.followup.send(
                 "❌ Aucun ticket trouvé avec ces critères.", ephemeral=True
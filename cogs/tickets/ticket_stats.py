@@ -2,15 +2,28 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import logging
-from database import Database, get_session
+from datetime import datetime
+from database import AsyncDatabase
 
 logger = logging.getLogger(__name__)
 
 
+# Durée lisible (ex: 2j 5h, 3h 12min, 45min)
+def format_duration(seconds):
+    minutes = int(seconds // 60)
+    days, minutes = divmod(minutes, 24 * 60)
+    hours, minutes = divmod(minutes, 60)
+    if days:
+        return f"{days}j {hours}h"
+    if hours:
+        return f"{hours}h {minutes}min"
+    return f"{minutes}min"
+
+
 class TicketStats(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
 
     @app_commands.command(
         name="ticket_stats", description="Statistiques du système de tickets"
@@ -18,37 +31,15 @@ class TicketStats(commands.Cog):
     @app_commands.checks.has_permissions(administrator=True)
     async def ticket_stats(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
-        from models import Ticket, TicketStatus, TicketType
-
-        with get_session() as session:
-            total_tickets = session.query(Ticket).count()
-            open_tickets = (
-                session.query(Ticket).filter(Ticket.status == TicketStatus.OPEN).count()
-            )
-            closed_tickets = (
-                session.query(Ticket)
-                .filter(Ticket.status == TicketStatus.CLOSED)
-                .count()
-            )
-            labo_tickets = (
-                session.query(Ticket)
-                .filter(Ticket.type == TicketType.JOIN_LABO)
-                .count()
-            )
-            pole_tickets = (
-                session.query(Ticket)
-                .filter(Ticket.type == TicketType.JOIN_POLE)
-                .count()
-            )
-            dev_requests = (
-                session.query(Ticket).filter(Ticket.pole_requested == "DEV").count()
-            )
-            ia_requests = (
-                session.query(Ticket).filter(Ticket.pole_requested == "IA").count()
-            )
-            infra_requests = (
-                session.query(Ticket).filter(Ticket.pole_requested == "INFRA").count()
-            )
+        stats = await self.db.get_ticket_stats()
+        total_tickets = stats["total"]
+        open_tickets = stats["open"]
+        closed_tickets = stats["closed"]
+        labo_tickets = stats["join_labo"]
+        pole_tickets = stats["join_pole"]
+        dev_requests = stats["poles"]["DEV"]
+        ia_requests = stats["poles"]["IA"]
+        infra_requests = stats["poles"]["INFRA"]
         embed = discord.Embed(
             title="📊 Statistiques des tickets",
             color=discord.Color.blue(),
@@ -79,6 +70,27 @@ class TicketStats(commands.Cog):
                 value=f"`{bar}` {closed_percent:.1f}%",
                 inline=False,
             )
+
+        # Tickets ouverts et fermés par semaine (semaines les plus récentes)
+        weekly_lines = [
+            f"`{datetime.strptime(week, '%Y-%m-%d').strftime('%d/%m')}` "
+            f"📥 {counts['opened']} · 📤 {counts['closed']}"
+            for week, counts in stats["weekly"].items()
+        ]
+        embed.add_field(
+            name="📅 Ouverts / fermés par semaine",
+            value="\n".join(weekly_lines) or "Aucune donnée",
+            inline=True,
+        )
+
+        median = stats["median_close_seconds"]
+        embed.add_field(
+            name="⏱️ Délai médian de fermeture",
+            value=(
+                format_duration(median) if median is not None else "Aucun ticket fermé"
+            ),
+            inline=True,
+        )
         await interaction.followup.send(embed=embed, ephemeral=True)
 
 
@@ -2,7 +2,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import logging
-from database import Database, get_session
+from database import AsyncDatabase
 from cogs.admin.is_admin import is_admin
 
 logger = logging.getLogger(__name__)
@@ -11,7 +11,7 @@ logger = logging.getLogger(__name__)
 class TicketTransfer(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = AsyncDatabase()
 
     @app_commands.command(
         name="ticket_transfer",
@@ -31,22 +31,12 @@ class TicketTransfer(commands.Cog):
                 f"❌ {admin.mention} n'est pas administrateur."
             )
             return
-        from models import Ticket, TicketStatus
-
-        with get_session() as session:
-            ticket = (
-                session.query(Ticket)
-                .filter(Ticket.id == ticket_id, Ticket.status == TicketStatus.OPEN)
-                .first()
+        ticket, old_assigned = await self.db.transfer_ticket(ticket_id, str(admin.id))
+        if not ticket:
+            await interaction.followup.send(
+                f"❌ Ticket #{ticket_id} introuvable ou fermé."
             )
-            if not ticket:
-                await interaction.followup.send(
-                    f"❌ Ticket #{ticket_id} introuvable ou fermé."
-                )
-                return
-            old_assigned = ticket.assigned_to
-            ticket.assigned_to = str(admin.id)
-            session.commit()
+            return
         channel = interaction.guild.get_channel(int(ticket.channel_id))
         if channel:
             embed = discord.Embed(
@@ -9,6 +9,11 @@ DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
 GUILD_ID = int(os.getenv("GUILD_ID", "0"))
 LOG_CHANNEL_ID = int(os.getenv("LOG_CHANNEL_ID", "0"))
 
+# Synchronisation des commandes slash : sur GUILD_ID uniquement (mise à jour
+# immédiate) plutôt que globalement, et forçage même si l'arbre n'a pas changé
+COMMAND_SYNC_GUILD = os.getenv("COMMAND_SYNC_GUILD", "false").lower() == "true"
+FORCE_COMMAND_SYNC = os.getenv("FORCE_COMMAND_SYNC", "false").lower() == "true"
+
 # Base de données - Construction sécurisée de l'URL
 DB_HOST = os.getenv("DB_HOST")
 DB_PORT = int(os.getenv("DB_PORT"))
@@ -33,6 +38,26 @@ else:
 # Alternative : utiliser DATABASE_URL si fourni directement
 DATABASE_URL = os.getenv("DATABASE_URL", DB_URL)
 
+# URL pour le driver asynchrone (asyncpg) utilisé par le bot
+ASYNC_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL",
+    DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1),
+)
+
+# Cache des statistiques (durée de vie en secondes, nombre d'entrées max)
+STATS_CACHE_TTL = int(os.getenv("STATS_CACHE_TTL", "300"))
+STATS_CACHE_SIZE = int(os.getenv("STATS_CACHE_SIZE", "256"))
+
+# Seuil (ms) au-delà duquel une requête SQL est journalisée comme lente
+SLOW_QUERY_MS = int(os.getenv("SLOW_QUERY_MS", "200"))
+
+# Retard de la boucle d'évènements (ms) au-delà duquel un blocage est journalisé
+LOOP_LAG_THRESHOLD_MS = int(os.getenv("LOOP_LAG_THRESHOLD_MS", "250"))
+
+# Endpoint Prometheus (/metrics) et healthcheck (/health), local par défaut
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "8000"))
+
 # Rôles autorisés pour l'administration
 ADMIN_ROLES = ["*"]
 
@@ -1,17 +1,69 @@
 # Gestionnaire de base de données (database.py)
 
-from contextlib import contextmanager
-from models import Session, Member, Meeting, Attendance, MemberStatus
-from datetime import datetime, timedelta
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from models import (
+    Session,
+    AsyncSession,
+    CommandSync,
+    Member,
+    Meeting,
+    MeetingTargetRole,
+    Attendance,
+    MemberAttendanceSummary,
+    MemberStatus,
+    rebuild_attendance_summary,
+)
+from sqlalchemy import (
+    Date,
+    Float,
+    String,
+    Text,
+    and_,
+    case,
+    cast,
+    event,
+    func,
+    literal,
+    literal_column,
+    null,
+    or_,
+    orm,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from datetime import datetime, time, timedelta
+from time import monotonic
+from collections import OrderedDict
+from config import STATS_CACHE_SIZE, STATS_CACHE_TTL
+import copy
+import asyncio
+import csv
+import functools
+import inspect
 import logging
 import json
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Session fournie par l'appelant (ex: AsyncDatabase), réutilisée par get_session
+_current_session = ContextVar("current_session", default=None)
+
 
 # Contexte de session pour les opérations DB
 @contextmanager
 def get_session():
+    current = _current_session.get()
+    if current is not None:
+        # L'appelant gère lui-même commit, rollback et fermeture
+        yield current
+        return
+
     session = Session()
     try:
         yield session
@@ -24,6 +76,328 @@ def get_session():
         session.close()
 
 
+# Cache LRU à durée de vie limitée pour les résultats des statistiques
+# Vidé par les écritures (voir _invalidates_stats) ; hits/misses pour le suivi
+# generation est incrémentée à chaque vidage : un résultat calculé avant un
+# vidage n'est pas stocké (il peut être antérieur à l'écriture)
+class StatsCache:
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, copy.deepcopy(entry[1])
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key, value, generation=None):
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            expires = monotonic() + self.ttl
+            self._entries[key] = (expires, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def info(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total * 100) if total > 0 else 0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+
+
+stats_cache = StatsCache(STATS_CACHE_SIZE, STATS_CACHE_TTL)
+
+
+# Rend les arguments hachables (les listes d'identifiants deviennent des tuples)
+def _freeze(value):
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+# Met en cache le résultat d'une statistique, clé = (fonction, arguments, fenêtre)
+def _stats_cached(func):
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # Écriture non validée dans la session en cours : ne pas lire le cache
+        current = _current_session.get()
+        if current is not None and current.info.get("stats_dirty"):
+            return func(*args, **kwargs)
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (func.__name__,) + tuple(
+            (name, _freeze(value)) for name, value in bound.arguments.items()
+        )
+        # Génération lue avant la requête : une invalidation pendant la lecture
+        # empêche de stocker ce résultat
+        generation = stats_cache.generation
+        found, result = stats_cache.get(key)
+        if found:
+            return result
+        result = func(*args, **kwargs)
+        stats_cache.set(key, result, generation)
+        return result
+
+    return wrapper
+
+
+# Marque une écriture qui rend les statistiques en cache obsolètes
+# Dans une session fournie par l'appelant, le cache est vidé au commit
+def _invalidates_stats(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        result = func(*args, **kwargs)
+        current = _current_session.get()
+        if current is not None:
+            current.info["stats_dirty"] = True
+        else:
+            stats_cache.clear()
+        return result
+
+    return wrapper
+
+
+# Fin de transaction : vider le cache si une écriture a eu lieu
+@event.listens_for(orm.Session, "after_commit")
+@event.listens_for(orm.Session, "after_rollback")
+def _clear_stats_cache(session):
+    if session.info.pop("stats_dirty", False):
+        stats_cache.clear()
+
+
+# Nombre de lignes lues par lot lors des exports
+EXPORT_BATCH_SIZE = 500
+
+
+# Date/heure au format des exports CSV (vide si absente)
+def _format_datetime(value):
+    return value.strftime("%Y-%m-%d %H:%M:%S") if value else ""
+
+
+# Filtre SQL : réunions ciblant un rôle donné ou tous les rôles ("ALL")
+# S'appuie sur la table meeting_target_roles (index sur role, meeting_id)
+# role peut être une chaîne ("DEV") ou une colonne (ex: Member.role)
+def _targets_role(role):
+    return Meeting.target_role_links.any(
+        or_(MeetingTargetRole.role == "ALL", MeetingTargetRole.role == role)
+    )
+
+
+# Fenêtre des statistiques en jours entiers (cohérente avec le résumé journalier)
+# Retourne (premier jour, dernier jour, filtre des réunions complétées et validées)
+def _stats_window(days):
+    today = datetime.utcnow().date()
+    since_day = today - timedelta(days=days)
+    completed = and_(
+        Meeting.date >= datetime.combine(since_day, time.min),
+        Meeting.date < datetime.combine(today + timedelta(days=1), time.min),
+        Meeting.is_completed == True,
+        Meeting.attendance_validated == True,
+    )
+    return since_day, today, completed
+
+
+# INSERT avec ON CONFLICT selon le moteur (SQLite accepte la même syntaxe)
+def _insert(session):
+    if session.get_bind().dialect.name == "sqlite":
+        return sqlite_insert
+    return pg_insert
+
+
+# Clé du résumé des présences pour une réunion : (rôles ciblés, jour)
+def _summary_key(meeting):
+    return meeting.target_roles or "[]", meeting.date.date()
+
+
+# Ajoute des compteurs au résumé des présences en une seule requête
+# rows : liste de dicts ou select de (member_id, target_roles, day, status, count)
+def _add_to_summary(session, rows):
+    insert = _insert(session)
+    if isinstance(rows, list):
+        stmt = insert(MemberAttendanceSummary).values(rows)
+    else:
+        stmt = insert(MemberAttendanceSummary).from_select(
+            ["member_id", "target_roles", "day", "status", "count"], rows
+        )
+    session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["member_id", "target_roles", "day", "status"],
+            set_={"count": MemberAttendanceSummary.count + stmt.excluded["count"]},
+        )
+    )
+
+
+# Ajoute delta au compteur d'un membre pour une réunion (rôles ciblés, jour)
+def _bump_attendance_summary(session, meeting, member_id, status, delta):
+    target_roles, day = _summary_key(meeting)
+    _add_to_summary(
+        session,
+        [
+            {
+                "member_id": member_id,
+                "target_roles": target_roles,
+                "day": day,
+                "status": status,
+                "count": delta,
+            }
+        ],
+    )
+
+
+# Présences d'une réunion groupées par (membre, statut), au format du résumé
+def _meeting_summary_rows(meeting, sign, member_ids=None):
+    target_roles, day = _summary_key(meeting)
+    query = select(
+        Attendance.member_id,
+        literal(target_roles, Text),
+        literal(day, Date),
+        Attendance.status,
+        func.count(Attendance.id) * sign,
+    ).where(Attendance.meeting_id == meeting.id, Attendance.member_id.isnot(None))
+    if member_ids is not None:
+        query = query.where(Attendance.member_id.in_(member_ids))
+    return query.group_by(Attendance.member_id, Attendance.status)
+
+
+# Ajoute (sign=1) ou retire (sign=-1) toutes les présences d'une réunion du résumé
+def _apply_meeting_summary(session, meeting, sign):
+    _add_to_summary(session, _meeting_summary_rows(meeting, sign))
+
+
+# Applique les modifications d'une réunion ; si l'appel est validé et que la
+# date ou les rôles ciblés changent, ses présences changent de clé dans le résumé
+def _update_meeting(session, meeting, changes):
+    moved = meeting.attendance_validated and (
+        "date" in changes or "target_roles" in changes
+    )
+    if moved:
+        _apply_meeting_summary(session, meeting, -1)
+    for key, value in changes.items():
+        if key == "target_roles":
+            meeting.set_target_roles(value)
+        else:
+            setattr(meeting, key, value)
+    if moved:
+        session.flush()
+        _apply_meeting_summary(session, meeting, 1)
+
+
+# Une réunion (valeur JSON de Meeting.target_roles) concerne-t-elle ce rôle ?
+def _concerns_role(target_roles, role):
+    roles = Meeting.parse_target_roles(target_roles)
+    return "ALL" in roles or role in roles
+
+
+# Réunions complétées et à venir groupées par rôles ciblés (une seule requête)
+# Retourne [(target_roles, complétées, à venir)]
+def _meeting_groups(session, completed, upcoming):
+    return (
+        session.query(
+            Meeting.target_roles,
+            func.count(case((completed, Meeting.id))),
+            func.count(case((upcoming, Meeting.id))),
+        )
+        .filter(or_(completed, upcoming))
+        .group_by(Meeting.target_roles)
+        .all()
+    )
+
+
+# Présences par membre et rôles ciblés sur la période, lues dans le résumé
+# Retourne [(member_id, target_roles, présences)]
+def _attended_by_target(session, since_day, today, *filters):
+    return (
+        session.query(
+            MemberAttendanceSummary.member_id,
+            MemberAttendanceSummary.target_roles,
+            func.sum(MemberAttendanceSummary.count),
+        )
+        .filter(
+            MemberAttendanceSummary.status == "present",
+            MemberAttendanceSummary.day >= since_day,
+            MemberAttendanceSummary.day <= today,
+            *filters,
+        )
+        .group_by(
+            MemberAttendanceSummary.member_id, MemberAttendanceSummary.target_roles
+        )
+        .all()
+    )
+
+
+# Change l'état d'un ticket en une requête (UPDATE ... WHERE ... RETURNING) :
+# la condition sur le statut rend la transition atomique, une seule des
+# requêtes concurrentes trouve la ligne. Retourne le ticket modifié ou None
+def _update_ticket(session, conditions, **values):
+    from models import Ticket
+
+    ticket = session.scalars(
+        update(Ticket)
+        .where(*conditions)
+        .values(**values)
+        .returning(Ticket)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    ).first()
+    if ticket:
+        session.expunge(ticket)
+    return ticket
+
+
+# Filtres SQL des membres par statut et pôle (optionnels)
+def _members_filter(status, role):
+    conditions = []
+    if status:
+        conditions.append(Member.status == status)
+    if role:
+        conditions.append(Member.role == role)
+    return conditions
+
+
+# Filtres SQL des tickets ouverts selon le filtre de /ticket_list
+# (all, join_labo, join_pole, assigned, unassigned)
+def _open_tickets_filter(filter_type):
+    from models import Ticket, TicketStatus, TicketType
+
+    conditions = [Ticket.status == TicketStatus.OPEN]
+    if filter_type == "join_labo":
+        conditions.append(Ticket.type == TicketType.JOIN_LABO)
+    elif filter_type == "join_pole":
+        conditions.append(Ticket.type == TicketType.JOIN_POLE)
+    elif filter_type == "assigned":
+        conditions.append(Ticket.assigned_to.isnot(None))
+    elif filter_type == "unassigned":
+        conditions.append(Ticket.assigned_to.is_(None))
+    return conditions
+
+
 # Classe utilitaire pour les opérations de base de données
 class Database:
 
@@ -42,6 +416,7 @@ class Database:
             return member
 
     @staticmethod
+    @_invalidates_stats
     def add_member(**kwargs):
         with get_session() as session:
             member = Member(**kwargs)
@@ -51,6 +426,7 @@ class Database:
             return member
 
     @staticmethod
+    @_invalidates_stats
     def update_member(discord_id: str, **kwargs):
         with get_session() as session:
             member = (
@@ -67,6 +443,7 @@ class Database:
             return member
 
     @staticmethod
+    @_invalidates_stats
     def delete_member(discord_id: str):
         with get_session() as session:
             member = (
@@ -92,6 +469,79 @@ class Database:
                 session.expunge(m)
             return members
 
+    @staticmethod
+    def get_members_page(offset: int, limit: int, status=None, role=None):
+        """Une page de membres triés par nom (même ordre que get_all_members)"""
+        with get_session() as session:
+            members = (
+                session.query(Member)
+                .filter(*_members_filter(status, role))
+                .order_by(Member.full_name, Member.id)
+                .offset(offset)
+                .limit(limit)
+                .all()
+            )
+            for m in members:
+                session.expunge(m)
+            return members
+
+    @staticmethod
+    def get_members_overview(status=None, role=None):
+        """Nombre de membres par pôle et par statut, en une requête groupée"""
+        with get_session() as session:
+            rows = (
+                session.query(Member.role, Member.status, func.count(Member.id))
+                .filter(*_members_filter(status, role))
+                .group_by(Member.role, Member.status)
+                .all()
+            )
+            overview = {"total": 0, "roles": {}, "statuses": {}}
+            for member_role, member_status, count in rows:
+                overview["total"] += count
+                if member_role:
+                    roles = overview["roles"]
+                    roles[member_role] = roles.get(member_role, 0) + count
+                statuses = overview["statuses"]
+                statuses[member_status.value] = (
+                    statuses.get(member_status.value, 0) + count
+                )
+            return overview
+
+    @staticmethod
+    def search_members(query: str, limit=10):
+        """Rechercher des membres par nom, username ou email
+
+        Sur Postgres, les correspondances approchées (fautes de frappe) sont
+        trouvées via pg_trgm et les résultats triés par similarité ; les index
+        trigrammes servent aussi les recherches de sous-chaînes (ILIKE).
+        """
+        with get_session() as session:
+            # Recherche de sous-chaîne : échapper les jokers de LIKE
+            escaped = query.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+            pattern = f"%{escaped}%"
+            columns = [Member.full_name, Member.username, Member.email]
+            matches = [column.ilike(pattern, escape="!") for column in columns]
+
+            if session.get_bind().dialect.name == "postgresql":
+                matches += [column.op("%")(query) for column in columns]
+                score = func.greatest(
+                    *[func.coalesce(func.similarity(c, query), 0) for c in columns]
+                )
+                order = [score.desc(), Member.full_name]
+            else:
+                order = [Member.full_name]
+
+            members = (
+                session.query(Member)
+                .filter(or_(*matches))
+                .order_by(*order)
+                .limit(limit)
+                .all()
+            )
+            for m in members:
+                session.expunge(m)
+            return members
+
     @staticmethod
     def get_members_by_roles(roles):
         """Récupérer les membres ayant un des rôles spécifiés"""
@@ -116,6 +566,7 @@ class Database:
 
     # --- Meetings ---
     @staticmethod
+    @_invalidates_stats
     def create_meeting(**kwargs):
         with get_session() as session:
             meeting = Meeting(**kwargs)
@@ -150,75 +601,74 @@ class Database:
                 session.expunge(m)
             return meetings
 
-    print()
-
     @staticmethod
+    @_invalidates_stats
     def delete_meeting(name: str):
-        with get_session as session:
-            meeting = session.query(Member).filter(Meeting.title == str(name)).first()
+        with get_session() as session:
+            meeting = session.query(Meeting).filter(Meeting.title == str(name)).first()
             if meeting:
+                if meeting.attendance_validated:
+                    _apply_meeting_summary(session, meeting, -1)
                 session.delete(meeting)
                 return True
             return False
 
     @staticmethod
+    @_invalidates_stats
     def delete_meeting_id(meeting_id: int):
-        with get_session as session:
-            meeting = session.query(Member).filter(Meeting.id == meeting_id).first()
+        with get_session() as session:
+            meeting = session.query(Meeting).filter(Meeting.id == meeting_id).first()
             if meeting:
+                if meeting.attendance_validated:
+                    _apply_meeting_summary(session, meeting, -1)
                 session.delete(meeting)
                 return True
             return False
 
     @staticmethod
+    @_invalidates_stats
     def update_meeting_by_name(name: str, **kwargs):
         with get_session() as session:
             meeting = session.query(Meeting).filter(Meeting.title == str(name)).first()
             if meeting:
-                for key, value in kwargs.items():
-                    if key == "target_roles":
-                        meeting.set_target_roles(value)
-                    else:
-                        setattr(meeting, key, value)
+                _update_meeting(session, meeting, kwargs)
                 session.flush()
                 session.expunge(meeting)
             return meeting
 
     @staticmethod
+    @_invalidates_stats
     def update_meeting_by_id(meeting_id: int, **kwargs):
         with get_session() as session:
             meeting = session.query(Meeting).filter(Meeting.id == meeting_id).first()
             if meeting:
-                for key, value in kwargs.items():
-                    if key == "target_roles":
-                        meeting.set_target_roles(value)
-                    else:
-                        setattr(meeting, key, value)
+                _update_meeting(session, meeting, kwargs)
                 session.flush()
                 session.expunge(meeting)
             return meeting
 
     @staticmethod
     def get_upcoming_meetings(limit=5, role=None):
-        with get_session() as session:
-            query = session.query(Meeting).filter(Meeting.date >= datetime.utcnow())
+        """Prochaines réunions (non terminées), triées par date
 
-            # Filtrer par rôle si spécifié
+        Filtre par rôle, tri et LIMIT faits en SQL (index partiel sur la date
+        des réunions non terminées). Retourne des lignes légères
+        (id, title, description, date, target_roles) et non des objets ORM.
+        """
+        with get_session() as session:
+            query = session.query(
+                Meeting.id,
+                Meeting.title,
+                Meeting.description,
+                Meeting.date,
+                Meeting.target_roles,
+            ).filter(Meeting.date >= datetime.utcnow(), Meeting.is_completed == False)
+
+            # Réunions qui ciblent ce rôle ou ALL
             if role:
-                # Rechercher les meetings qui ciblent ce rôle ou ALL
-                meetings = query.all()
-                filtered = []
-                for meeting in meetings:
-                    target_roles = meeting.get_target_roles()
-                    if "ALL" in target_roles or role in target_roles:
-                        filtered.append(meeting)
-                meetings = filtered[:limit]
-            else:
-                meetings = query.order_by(Meeting.date).limit(limit).all()
+                query = query.filter(_targets_role(role))
 
-            for m in meetings:
-                session.expunge(m)
-            return meetings
+            return query.order_by(Meeting.date, Meeting.id).limit(limit).all()
 
     @staticmethod
     def get_member_upcoming_meetings(member_id: int):
@@ -228,23 +678,18 @@ class Database:
             if not member:
                 return []
 
-            # Récupérer toutes les réunions à venir
+            # Réunions à venir ciblant le rôle du membre
             meetings = (
                 session.query(Meeting)
                 .filter(Meeting.date >= datetime.utcnow())
                 .filter(Meeting.is_completed == False)
+                .filter(_targets_role(member.role))
                 .all()
             )
 
-            # Filtrer selon le rôle du membre
-            upcoming = []
             for meeting in meetings:
-                target_roles = meeting.get_target_roles()
-                if "ALL" in target_roles or member.role in target_roles:
-                    session.expunge(meeting)
-                    upcoming.append(meeting)
-
-            return upcoming
+                session.expunge(meeting)
+            return meetings
 
     # --- Tickets ---
     @staticmethod
@@ -287,6 +732,32 @@ class Database:
             session.expunge(settings)
             return settings
 
+    # --- Synchronisation des commandes slash ---
+    @staticmethod
+    def get_command_tree_hash(scope: str):
+        """Empreinte du dernier arbre de commandes synchronisé pour cette portée"""
+        with get_session() as session:
+            return (
+                session.query(CommandSync.tree_hash)
+                .filter(CommandSync.scope == scope)
+                .scalar()
+            )
+
+    @staticmethod
+    def set_command_tree_hash(scope: str, tree_hash: str):
+        """Enregistrer l'empreinte de l'arbre de commandes synchronisé"""
+        with get_session() as session:
+            now = datetime.utcnow()
+            stmt = _insert(session)(CommandSync).values(
+                scope=scope, tree_hash=tree_hash, synced_at=now
+            )
+            session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[CommandSync.scope],
+                    set_={"tree_hash": tree_hash, "synced_at": now},
+                )
+            )
+
     @staticmethod
     def get_user_open_ticket(discord_user_id: str):
         """Vérifier si un utilisateur a un ticket ouvert"""
@@ -355,22 +826,35 @@ class Database:
 
     @staticmethod
     def close_ticket(channel_id: str, closed_by: str):
-        """Fermer un ticket"""
+        """Fermer le ticket ouvert d'un canal (None s'il est déjà fermé)"""
         with get_session() as session:
             from models import Ticket, TicketStatus
 
-            ticket = (
-                session.query(Ticket)
-                .filter(Ticket.channel_id == str(channel_id))
-                .first()
+            return _update_ticket(
+                session,
+                [
+                    Ticket.channel_id == str(channel_id),
+                    Ticket.status == TicketStatus.OPEN,
+                ],
+                status=TicketStatus.CLOSED,
+                closed_at=datetime.utcnow(),
+                closed_by=str(closed_by),
+            )
+
+    @staticmethod
+    def close_ticket_by_id(ticket_id: int, closed_by: str):
+        """Fermer un ticket ouvert par son ID (None s'il est introuvable ou
+        déjà fermé, ex: fermé au même moment par un autre admin)"""
+        with get_session() as session:
+            from models import Ticket, TicketStatus
+
+            return _update_ticket(
+                session,
+                [Ticket.id == ticket_id, Ticket.status == TicketStatus.OPEN],
+                status=TicketStatus.CLOSED,
+                closed_at=datetime.utcnow(),
+                closed_by=str(closed_by),
             )
-            if ticket:
-                ticket.status = TicketStatus.CLOSED
-                ticket.closed_at = datetime.utcnow()
-                ticket.closed_by = str(closed_by)
-                session.flush()
-                session.expunge(ticket)
-            return ticket
 
     @staticmethod
     def get_open_tickets():
@@ -389,24 +873,299 @@ class Database:
             return tickets
 
     @staticmethod
-    def assign_ticket(channel_id: str, assigned_to: str):
-        """Assigner un ticket à un admin"""
+    def get_open_tickets_page(
+        limit: int,
+        after: tuple = None,
+        before: tuple = None,
+        inclusive: bool = False,
+        last: bool = False,
+        filter_type: str = "all",
+    ):
+        """Une page de tickets ouverts, du plus récent au plus ancien, par
+        pagination keyset sur (created_at, id) :
+        - after : tickets plus anciens que cette clé (page suivante)
+        - before : tickets plus récents que cette clé (page précédente)
+        - last : les plus anciens (dernière page)"""
         with get_session() as session:
             from models import Ticket
 
-            ticket = (
-                session.query(Ticket)
-                .filter(Ticket.channel_id == str(channel_id))
-                .first()
+            key = tuple_(Ticket.created_at, Ticket.id)
+            query = session.query(Ticket).filter(*_open_tickets_filter(filter_type))
+            if before is not None or last:
+                # Parcours dans l'ordre croissant puis remise dans l'ordre de la liste
+                if before is not None:
+                    query = query.filter(key > tuple_(*before))
+                query = query.order_by(Ticket.created_at, Ticket.id)
+                tickets = query.limit(limit).all()[::-1]
+            else:
+                if after is not None:
+                    query = query.filter(
+                        key <= tuple_(*after) if inclusive else key < tuple_(*after)
+                    )
+                query = query.order_by(Ticket.created_at.desc(), Ticket.id.desc())
+                tickets = query.limit(limit).all()
+            for ticket in tickets:
+                session.expunge(ticket)
+            return tickets
+
+    @staticmethod
+    def count_open_tickets(filter_type: str = "all"):
+        """Nombre de tickets ouverts (index partiel des tickets ouverts)"""
+        with get_session() as session:
+            from models import Ticket
+
+            return (
+                session.query(func.count(Ticket.id))
+                .filter(*_open_tickets_filter(filter_type))
+                .scalar()
+            )
+
+    @staticmethod
+    def get_open_tickets_summary():
+        """Répartition des tickets ouverts par type, pôle et assignation"""
+        with get_session() as session:
+            from models import Ticket, TicketStatus
+
+            assigned = Ticket.assigned_to.isnot(None)
+            rows = (
+                session.query(
+                    Ticket.type,
+                    Ticket.pole_requested,
+                    assigned.label("assigned"),
+                    func.count(Ticket.id),
+                )
+                .filter(Ticket.status == TicketStatus.OPEN)
+                .group_by(Ticket.type, Ticket.pole_requested, assigned)
+                .all()
+            )
+
+            summary = {
+                "total": 0,
+                "join_labo": 0,
+                "join_pole": 0,
+                "assigned": 0,
+                "unassigned": 0,
+                "poles": {},
+            }
+            for ticket_type, pole, is_assigned, count in rows:
+                summary["total"] += count
+                summary[ticket_type.value] += count
+                summary["assigned" if is_assigned else "unassigned"] += count
+                if pole:
+                    summary["poles"][pole] = summary["poles"].get(pole, 0) + count
+            return summary
+
+    @staticmethod
+    def assign_ticket(channel_id: str, assigned_to: str):
+        """Assigner le ticket ouvert d'un canal à un admin"""
+        with get_session() as session:
+            from models import Ticket, TicketStatus
+
+            return _update_ticket(
+                session,
+                [
+                    Ticket.channel_id == str(channel_id),
+                    Ticket.status == TicketStatus.OPEN,
+                ],
+                assigned_to=str(assigned_to),
             )
+
+    @staticmethod
+    def get_ticket(ticket_id: int):
+        """Récupérer un ticket par son ID"""
+        with get_session() as session:
+            from models import Ticket
+
+            ticket = session.query(Ticket).filter(Ticket.id == ticket_id).first()
             if ticket:
-                ticket.assigned_to = str(assigned_to)
-                session.flush()
                 session.expunge(ticket)
             return ticket
 
+    @staticmethod
+    def reopen_ticket(ticket_id: int, channel_id: str = None):
+        """Rouvrir un ticket (avec éventuellement un nouveau canal)"""
+        with get_session() as session:
+            from models import Ticket, TicketStatus
+
+            values = {"status": TicketStatus.OPEN, "closed_at": None, "closed_by": None}
+            if channel_id:
+                values["channel_id"] = str(channel_id)
+            # Seul un ticket fermé peut être rouvert (None sinon)
+            return _update_ticket(
+                session,
+                [Ticket.id == ticket_id, Ticket.status == TicketStatus.CLOSED],
+                **values,
+            )
+
+    @staticmethod
+    def transfer_ticket(ticket_id: int, assigned_to: str):
+        """Transférer un ticket ouvert, retourne (ticket, ancien assigné)"""
+        with get_session() as session:
+            from models import Ticket, TicketStatus
+
+            # Ligne verrouillée jusqu'au commit (Postgres) : un transfert simultané
+            # attend et lit l'assigné écrit par celui-ci
+            old_assigned = (
+                session.query(Ticket.assigned_to)
+                .filter(Ticket.id == ticket_id, Ticket.status == TicketStatus.OPEN)
+                .with_for_update()
+                .first()
+            )
+            if not old_assigned:
+                return None, None
+            ticket = _update_ticket(
+                session,
+                [Ticket.id == ticket_id, Ticket.status == TicketStatus.OPEN],
+                assigned_to=str(assigned_to),
+            )
+            return ticket, old_assigned.assigned_to if ticket else None
+
+    @staticmethod
+    def search_tickets(
+        discord_user_id: str = None, ticket_id: int = None, include_closed=False
+    ):
+        """Rechercher des tickets par utilisateur et/ou ID"""
+        with get_session() as session:
+            from models import Ticket, TicketStatus
+
+            query = session.query(Ticket)
+            if discord_user_id:
+                query = query.filter(Ticket.discord_user_id == str(discord_user_id))
+            if ticket_id:
+                query = query.filter(Ticket.id == ticket_id)
+            if not include_closed:
+                query = query.filter(Ticket.status != TicketStatus.CLOSED)
+            tickets = query.order_by(Ticket.created_at.desc()).all()
+            for ticket in tickets:
+                session.expunge(ticket)
+            return tickets
+
+    @staticmethod
+    def get_ticket_stats(weeks: int = 8):
+        """Statistiques globales des tickets, calculées en une seule requête"""
+        with get_session() as session:
+            from models import Ticket, TicketStatus, TicketType
+
+            postgres = session.get_bind().dialect.name == "postgresql"
+            today = datetime.combine(datetime.utcnow().date(), time.min)
+            since = today - timedelta(days=today.weekday(), weeks=weeks - 1)
+
+            # Lundi de la semaine d'une date (YYYY-MM-DD) et durée en secondes
+            def week_of(column):
+                if postgres:
+                    return func.to_char(
+                        func.date_trunc(literal_column("'week'"), column),
+                        literal_column("'YYYY-MM-DD'"),
+                    )
+                return func.date(
+                    column, literal_column("'weekday 0'"), literal_column("'-6 days'")
+                )
+
+            if postgres:
+                close_seconds = func.extract(
+                    literal_column("epoch"), Ticket.closed_at - Ticket.created_at
+                )
+            else:
+                close_seconds = (
+                    func.julianday(Ticket.closed_at) - func.julianday(Ticket.created_at)
+                ) * 86400
+
+            # Une ligne par requête partielle : (kind, status, type, pole, week, value)
+            def row(kind, status=None, type=None, pole=None, week=None, value=None):
+                return (
+                    literal_column(f"'{kind}'").label("kind"),
+                    cast(status if status is not None else null(), String).label(
+                        "status"
+                    ),
+                    cast(type if type is not None else null(), String).label("type"),
+                    cast(pole if pole is not None else null(), String).label("pole"),
+                    cast(week if week is not None else null(), String).label("week"),
+                    cast(value, Float).label("value"),
+                )
+
+            groups = select(
+                *row(
+                    "group",
+                    Ticket.status,
+                    Ticket.type,
+                    Ticket.pole_requested,
+                    value=func.count(),
+                )
+            ).group_by(Ticket.status, Ticket.type, Ticket.pole_requested)
+
+            opened_week = week_of(Ticket.created_at)
+            opened = (
+                select(*row("opened", week=opened_week, value=func.count()))
+                .where(Ticket.created_at >= since)
+                .group_by(opened_week)
+            )
+            closed_week = week_of(Ticket.closed_at)
+            closed = (
+                select(*row("closed", week=closed_week, value=func.count()))
+                .where(Ticket.closed_at >= since)
+                .group_by(closed_week)
+            )
+
+            # Médiane du délai de fermeture : rang de chaque durée (fonction de
+            # fenêtre), moyenne des une ou deux valeurs du milieu
+            durations = (
+                select(
+                    close_seconds.label("seconds"),
+                    func.row_number().over(order_by=close_seconds).label("rank"),
+                    func.count().over().label("total"),
+                )
+                .where(
+                    Ticket.status == TicketStatus.CLOSED,
+                    Ticket.closed_at.isnot(None),
+                )
+                .subquery()
+            )
+            median = select(*row("median", value=func.avg(durations.c.seconds))).where(
+                durations.c.rank.in_(
+                    [(durations.c.total + 1) // 2, (durations.c.total + 2) // 2]
+                )
+            )
+
+            stats = {
+                "total": 0,
+                "open": 0,
+                "closed": 0,
+                "join_labo": 0,
+                "join_pole": 0,
+                "poles": {"DEV": 0, "IA": 0, "INFRA": 0},
+                "weekly": {},
+                "median_close_seconds": None,
+            }
+            weekly = stats["weekly"]
+            for week in range(weeks):
+                day = (since + timedelta(weeks=week)).strftime("%Y-%m-%d")
+                weekly[day] = {"opened": 0, "closed": 0}
+
+            for kind, status, type, pole, week, value in session.execute(
+                union_all(groups, opened, closed, median)
+            ):
+                if kind == "group":
+                    count = int(value)
+                    stats["total"] += count
+                    if status == TicketStatus.OPEN.name:
+                        stats["open"] += count
+                    elif status == TicketStatus.CLOSED.name:
+                        stats["closed"] += count
+                    if type == TicketType.JOIN_LABO.name:
+                        stats["join_labo"] += count
+                    elif type == TicketType.JOIN_POLE.name:
+                        stats["join_pole"] += count
+                    if pole in stats["poles"]:
+                        stats["poles"][pole] += count
+                elif kind == "median":
+                    stats["median_close_seconds"] = value
+                elif week in weekly:
+                    weekly[week][kind] = int(value)
+            return stats
+
     # --- Présence ---
     @staticmethod
+    @_invalidates_stats
     def record_attendance(
         meeting_id: int, member_id: int, status="present", modified_by=None
     ):
@@ -420,6 +1179,15 @@ class Database:
                 .first()
             )
 
+            # Appel déjà validé : répercuter le changement dans le résumé
+            meeting = session.get(Meeting, meeting_id)
+            if meeting and meeting.attendance_validated:
+                if attendance:
+                    _bump_attendance_summary(
+                        session, meeting, member_id, attendance.status, -1
+                    )
+                _bump_attendance_summary(session, meeting, member_id, status, 1)
+
             if not attendance:
                 attendance = Attendance(
                     meeting_id=meeting_id, member_id=member_id, status=status
@@ -437,37 +1205,157 @@ class Database:
             return attendance
 
     @staticmethod
-    def validate_attendance(meeting_id: int, validated_by: str):
-        """Valider l'appel d'une réunion et la marquer comme complétée"""
+    @_invalidates_stats
+    def record_attendance_bulk(meeting_id: int, statuses: dict, modified_by=None):
+        """Enregistrer plusieurs présences d'une réunion en une seule requête
+
+        statuses : {member_id: status}. Utilise INSERT ... ON CONFLICT DO UPDATE
+        sur l'index unique (meeting_id, member_id). Retourne le nombre de lignes.
+        """
+        if not statuses:
+            return 0
+
         with get_session() as session:
-            meeting = session.query(Meeting).filter(Meeting.id == meeting_id).first()
-            if meeting:
-                meeting.attendance_validated = True
-                meeting.attendance_validated_at = datetime.utcnow()
-                meeting.attendance_validated_by = validated_by
-                # IMPORTANT: Marquer la réunion comme complétée pour les statistiques
-                meeting.is_completed = True
+            now = datetime.utcnow()
+
+            # Appel déjà validé : répercuter les changements dans le résumé
+            meeting = session.get(Meeting, meeting_id)
+            if meeting and meeting.attendance_validated:
+                target_roles, day = _summary_key(meeting)
+                _add_to_summary(
+                    session, _meeting_summary_rows(meeting, -1, list(statuses))
+                )
+                _add_to_summary(
+                    session,
+                    [
+                        {
+                            "member_id": member_id,
+                            "target_roles": target_roles,
+                            "day": day,
+                            "status": status,
+                            "count": 1,
+                        }
+                        for member_id, status in statuses.items()
+                    ],
+                )
 
-                # Mettre à jour last_active pour tous les membres présents
-                attendances = (
-                    session.query(Attendance)
-                    .filter(
-                        Attendance.meeting_id == meeting_id,
-                        Attendance.status == "present",
-                    )
-                    .all()
+            stmt = _insert(session)(Attendance).values(
+                [
+                    {
+                        "meeting_id": meeting_id,
+                        "member_id": member_id,
+                        "status": status,
+                        "timestamp": now,
+                    }
+                    for member_id, status in statuses.items()
+                ]
+            )
+            # Même comportement que record_attendance pour une ligne existante
+            updates = {"status": stmt.excluded.status, "timestamp": now}
+            if modified_by:
+                updates["modified_at"] = now
+                updates["modified_by"] = modified_by
+            session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["meeting_id", "member_id"], set_=updates
                 )
+            )
+            return len(statuses)
+
+    @staticmethod
+    @_invalidates_stats
+    def validate_attendance(
+        meeting_id: int, validated_by: str, expected_member_ids=None
+    ):
+        """Valider l'appel d'une réunion et la marquer comme complétée
+
+        Les membres de expected_member_ids sans présence enregistrée sont marqués
+        absents. Le nombre de requêtes ne dépend pas de la taille de la réunion.
+        """
+        with get_session() as session:
+            now = datetime.utcnow()
+            validation = {
+                "attendance_validated": True,
+                "attendance_validated_at": now,
+                "attendance_validated_by": validated_by,
+                # IMPORTANT: Marquer la réunion comme complétée pour les statistiques
+                "is_completed": True,
+            }
 
-                for att in attendances:
-                    member = (
-                        session.query(Member).filter(Member.id == att.member_id).first()
+            # Première validation ? (sinon simple mise à jour de la validation)
+            first = session.execute(
+                update(Meeting)
+                .where(
+                    Meeting.id == meeting_id, Meeting.attendance_validated.isnot(True)
+                )
+                .values(**validation)
+                .returning(Meeting.id, Meeting.date, Meeting.target_roles)
+                .execution_options(synchronize_session=False)
+            ).first()
+            meeting = (
+                first
+                or session.execute(
+                    update(Meeting)
+                    .where(Meeting.id == meeting_id)
+                    .values(**validation)
+                    .returning(Meeting.id, Meeting.date, Meeting.target_roles)
+                    .execution_options(synchronize_session=False)
+                ).first()
+            )
+            if meeting is None:
+                return False
+            target_roles, day = _summary_key(meeting)
+
+            # Marquer les membres attendus non marqués comme absents
+            if expected_member_ids:
+                inserted = session.execute(
+                    _insert(session)(Attendance)
+                    .values(
+                        [
+                            {
+                                "meeting_id": meeting_id,
+                                "member_id": member_id,
+                                "status": "absent",
+                                "timestamp": now,
+                            }
+                            for member_id in expected_member_ids
+                        ]
+                    )
+                    .on_conflict_do_nothing(index_elements=["meeting_id", "member_id"])
+                    .returning(Attendance.member_id)
+                ).all()
+                # Appel déjà validé : seuls les nouveaux absents entrent au résumé
+                if first is None and inserted:
+                    _add_to_summary(
+                        session,
+                        [
+                            {
+                                "member_id": row.member_id,
+                                "target_roles": target_roles,
+                                "day": day,
+                                "status": "absent",
+                                "count": 1,
+                            }
+                            for row in inserted
+                        ],
                     )
-                    if member:
-                        member.last_active = datetime.utcnow()
 
-                session.flush()
-                return True
-            return False
+            # Première validation : les présences entrent dans le résumé
+            if first is not None:
+                _apply_meeting_summary(session, meeting, 1)
+
+            # Mettre à jour last_active pour tous les membres présents
+            session.execute(
+                update(Member)
+                .where(
+                    Member.id == Attendance.member_id,
+                    Attendance.meeting_id == meeting_id,
+                    Attendance.status == "present",
+                )
+                .values(last_active=now)
+                .execution_options(synchronize_session=False)
+            )
+            return True
 
     @staticmethod
     def get_meeting_attendance(meeting_id: int):
@@ -487,6 +1375,7 @@ class Database:
             return result
 
     @staticmethod
+    @_stats_cached
     def get_meeting_stats(meeting_id: int):
         """Retourne des statistiques pour une réunion donnée"""
         with get_session() as session:
@@ -556,99 +1445,312 @@ class Database:
                 "rate": rate,
             }
 
-    # --- Statistiques ---
+    # --- Export ---
     @staticmethod
-    def get_member_stats(member_id: int, days=30):
-        """Calcule les statistiques d'un membre incluant les réunions à venir"""
+    def write_export_csv(dataset: str, output):
+        """Écrire l'export CSV d'un jeu de données dans un flux texte
+
+        dataset : membres, reunions ou presences. Sur Postgres le CSV est généré
+        par COPY ... TO STDOUT ; sinon les lignes sont lues par lots depuis un
+        curseur serveur (yield_per). Dans les deux cas elles sont écrites au fur
+        et à mesure, la mémoire utilisée ne dépend donc pas du volume exporté.
+        Retourne le nombre de lignes exportées.
+        """
+        if dataset == "membres":
+            header = [
+                "ID",
+                "Discord ID",
+                "Username",
+                "Nom Complet",
+                "Email",
+                "Pôle",
+                "Spécialisation",
+                "Statut",
+                "Membre Depuis",
+                "Dernière Activité",
+            ]
+            status_values = " ".join(
+                f"WHEN '{status.name}' THEN '{status.value}'" for status in MemberStatus
+            )
+            copy_columns = [
+                "id",
+                "discord_id",
+                "username",
+                "NULLIF(full_name, '')",
+                "NULLIF(email, '')",
+                "NULLIF(role, '')",
+                "NULLIF(specialization, '')",
+                f"CASE status {status_values} END",
+                "to_char(joined_at, 'YYYY-MM-DD HH24:MI:SS')",
+                "to_char(last_active, 'YYYY-MM-DD HH24:MI:SS')",
+            ]
+            copy_from = "members ORDER BY full_name"
+            columns = [
+                Member.id,
+                Member.discord_id,
+                Member.username,
+                Member.full_name,
+                Member.email,
+                Member.role,
+                Member.specialization,
+                Member.status,
+                Member.joined_at,
+                Member.last_active,
+            ]
+
+            def format_row(row):
+                return [
+                    row.id,
+                    row.discord_id,
+                    row.username,
+                    row.full_name or "",
+                    row.email or "",
+                    row.role or "",
+                    row.specialization or "",
+                    row.status.value,
+                    _format_datetime(row.joined_at),
+                    _format_datetime(row.last_active),
+                ]
+
+        elif dataset == "reunions":
+            header = [
+                "ID",
+                "Titre",
+                "Description",
+                "Date",
+                "Heure",
+                "Créateur",
+                "Organisateur ID",
+                "Pôles Ciblés",
+                "Complétée",
+                "Appel Validé",
+            ]
+            copy_columns = [
+                "id",
+                "title",
+                "NULLIF(description, '')",
+                "to_char(date, 'YYYY-MM-DD')",
+                "to_char(date, 'HH24:MI')",
+                "created_by",
+                "organizer_id",
+                "COALESCE(NULLIF(target_roles, ''), 'ALL')",
+                "CASE WHEN is_completed THEN 'Oui' ELSE 'Non' END",
+                "CASE WHEN attendance_validated THEN 'Oui' ELSE 'Non' END",
+            ]
+            copy_from = "meetings ORDER BY id"
+            columns = [
+                Meeting.id,
+                Meeting.title,
+                Meeting.description,
+                Meeting.date,
+                Meeting.created_by,
+                Meeting.organizer_id,
+                Meeting.target_roles,
+                Meeting.is_completed,
+                Meeting.attendance_validated,
+            ]
+
+            def format_row(row):
+                return [
+                    row.id,
+                    row.title,
+                    row.description or "",
+                    row.date.strftime("%Y-%m-%d"),
+                    row.date.strftime("%H:%M"),
+                    row.created_by,
+                    row.organizer_id or "",
+                    row.target_roles or "ALL",
+                    "Oui" if row.is_completed else "Non",
+                    "Oui" if row.attendance_validated else "Non",
+                ]
+
+        elif dataset == "presences":
+            header = [
+                "Réunion ID",
+                "Réunion",
+                "Membre ID",
+                "Membre",
+                "Statut",
+                "Date/Heure",
+                "Modifié Par",
+                "Date Modification",
+            ]
+            copy_columns = [
+                "mt.id",
+                "mt.title",
+                "mb.id",
+                "COALESCE(NULLIF(mb.full_name, ''), mb.username)",
+                "a.status",
+                "to_char(a.timestamp, 'YYYY-MM-DD HH24:MI:SS')",
+                "NULLIF(a.modified_by, '')",
+                "to_char(a.modified_at, 'YYYY-MM-DD HH24:MI:SS')",
+            ]
+            copy_from = (
+                "attendances a JOIN meetings mt ON a.meeting_id = mt.id "
+                "JOIN members mb ON a.member_id = mb.id ORDER BY a.id"
+            )
+            columns = [
+                Meeting.id.label("meeting_id"),
+                Meeting.title,
+                Member.id.label("member_id"),
+                Member.full_name,
+                Member.username,
+                Attendance.status,
+                Attendance.timestamp,
+                Attendance.modified_by,
+                Attendance.modified_at,
+            ]
+
+            def format_row(row):
+                return [
+                    row.meeting_id,
+                    row.title,
+                    row.member_id,
+                    row.full_name or row.username,
+                    row.status,
+                    _format_datetime(row.timestamp),
+                    row.modified_by or "",
+                    _format_datetime(row.modified_at),
+                ]
+
+        else:
+            raise ValueError(f"Jeu de données d'export inconnu: {dataset}")
+
         with get_session() as session:
-            since = datetime.utcnow() - timedelta(days=days)
+            # Postgres (psycopg2) : COPY produit le CSV côté serveur, sans passer
+            # par des objets Python ligne par ligne
+            if session.get_bind().dialect.driver == "psycopg2":
+                select_list = ", ".join(
+                    f'{expr} AS "{name}"' for expr, name in zip(copy_columns, header)
+                )
+                sql = (
+                    f"COPY (SELECT {select_list} FROM {copy_from}) "
+                    "TO STDOUT WITH CSV HEADER"
+                )
+                with session.connection().connection.cursor() as cursor:
+                    cursor.copy_expert(sql, output)
+                    return cursor.rowcount
+
+            # Autres moteurs : lecture par lots via l'ORM
+            writer = csv.writer(output)
+            writer.writerow(header)
+            count = 0
+            query = session.query(*columns)
+            if dataset == "membres":
+                query = query.order_by(Member.full_name)
+            elif dataset == "reunions":
+                query = query.order_by(Meeting.id)
+            else:
+                query = (
+                    query.select_from(Attendance)
+                    .join(Meeting, Attendance.meeting_id == Meeting.id)
+                    .join(Member, Attendance.member_id == Member.id)
+                    .order_by(Attendance.id)
+                )
 
-            # Récupérer le membre pour son rôle
-            member = session.query(Member).filter(Member.id == member_id).first()
-            if not member:
-                return {
-                    "total": 0,
-                    "attended": 0,
-                    "rate": 0,
-                    "upcoming": 0,
-                    "completed": 0,
-                }
+            for row in query.yield_per(EXPORT_BATCH_SIZE):
+                writer.writerow(format_row(row))
+                count += 1
+        return count
 
-            # Meetings COMPLÉTÉS concernant ce membre
-            all_completed_meetings = (
-                session.query(Meeting)
-                .filter(
-                    Meeting.date >= since,
-                    Meeting.date <= datetime.utcnow(),
-                    Meeting.is_completed == True,  # Seulement les réunions complétées
-                    Meeting.attendance_validated == True,  # ET validées
-                )
-                .all()
-            )
+    # --- Statistiques ---
+    @staticmethod
+    @_invalidates_stats
+    def rebuild_attendance_summary():
+        """Reconstruire member_attendance_summary depuis l'historique des présences"""
+        with get_session() as session:
+            return rebuild_attendance_summary(session)
 
-            # Filtrer par rôle ciblé pour les réunions complétées
-            relevant_completed = []
-            for meeting in all_completed_meetings:
-                target_roles = meeting.get_target_roles()
-                if "ALL" in target_roles or member.role in target_roles:
-                    relevant_completed.append(meeting.id)
+    @staticmethod
+    def get_member_stats(member_id: int, days=30):
+        """Calcule les statistiques d'un membre incluant les réunions à venir"""
+        return Database.get_members_stats([member_id], days)[member_id]
 
-            total_completed = len(relevant_completed)
+    @staticmethod
+    @_stats_cached
+    def get_members_stats(member_ids, days=30):
+        """Statistiques de plusieurs membres en une seule requête groupée
+
+        Retourne un dictionnaire {member_id: stats} avec les mêmes clés que
+        get_member_stats (total, attended, rate, upcoming, completed).
+        """
+        member_ids = list(member_ids)
+        stats = {
+            member_id: {
+                "total": 0,
+                "attended": 0,
+                "rate": 0,
+                "upcoming": 0,
+                "completed": 0,
+            }
+            for member_id in member_ids
+        }
+        if not member_ids:
+            return stats
 
-            # Compter les présences sur les réunions complétées
-            attended = (
-                (
-                    session.query(Attendance)
-                    .filter(
-                        Attendance.member_id == member_id,
-                        Attendance.status == "present",
-                        (
-                            Attendance.meeting_id.in_(relevant_completed)
-                            if relevant_completed
-                            else False
-                        ),
-                    )
-                    .count()
-                )
-                if relevant_completed
-                else 0
-            )
+        with get_session() as session:
+            now = datetime.utcnow()
+            since_day, today, completed = _stats_window(days)
+            upcoming = and_(Meeting.date >= now, Meeting.is_completed == False)
 
-            # Meetings À VENIR concernant ce membre
-            upcoming_meetings = (
-                session.query(Meeting)
-                .filter(
-                    Meeting.date >= datetime.utcnow(), Meeting.is_completed == False
-                )
+            roles = dict(
+                session.query(Member.id, Member.role)
+                .filter(Member.id.in_(member_ids))
                 .all()
             )
+            groups = _meeting_groups(session, completed, upcoming)
+
+            # Présences lues dans le résumé, gardées seulement pour les réunions
+            # qui ciblent le rôle du membre : numérateur et dénominateur portent
+            # sur les mêmes réunions (une présence à la réunion d'un autre pôle
+            # ne compte pas)
+            attended = dict.fromkeys(roles, 0)
+            for member_id, target_roles, count in _attended_by_target(
+                session,
+                since_day,
+                today,
+                MemberAttendanceSummary.member_id.in_(member_ids),
+            ):
+                if _concerns_role(target_roles, roles.get(member_id)):
+                    attended[member_id] += count
+
+            for member_id, role in roles.items():
+                total_completed = upcoming_count = 0
+                for target_roles, completed_count, upcoming_group in groups:
+                    if _concerns_role(target_roles, role):
+                        total_completed += completed_count
+                        upcoming_count += upcoming_group
+                attended_count = int(attended[member_id])
+                stats[member_id] = {
+                    "total": total_completed,
+                    "attended": attended_count,
+                    "rate": (
+                        (attended_count / total_completed * 100)
+                        if total_completed > 0
+                        else 0
+                    ),
+                    "upcoming": upcoming_count,
+                    "completed": total_completed,
+                }
 
-            upcoming_count = 0
-            for meeting in upcoming_meetings:
-                target_roles = meeting.get_target_roles()
-                if "ALL" in target_roles or member.role in target_roles:
-                    upcoming_count += 1
-
-            return {
-                "total": total_completed,
-                "attended": attended,
-                "rate": (
-                    (attended / total_completed * 100) if total_completed > 0 else 0
-                ),
-                "upcoming": upcoming_count,
-                "completed": total_completed,
-            }
+            return stats
 
     @staticmethod
+    @_stats_cached
     def get_role_stats(role: str, days=30):
         """Statistiques par pôle (DEV, IA, INFRA)"""
         with get_session() as session:
-            since = datetime.utcnow() - timedelta(days=days)
+            now = datetime.utcnow()
+            since_day, today, completed = _stats_window(days)
+
+            upcoming = and_(Meeting.date >= now, Meeting.is_completed == False)
+            in_role = and_(Member.role == role, Member.status == MemberStatus.ACTIVE)
 
-            # Membres du pôle
+            # Membres actifs du pôle
             members = (
-                session.query(Member)
-                .filter(Member.role == role, Member.status == MemberStatus.ACTIVE)
+                session.query(Member.id, Member.full_name, Member.username)
+                .filter(in_role)
+                .order_by(Member.full_name)
                 .all()
             )
 
@@ -662,51 +1764,40 @@ class Database:
                     "top_members": [],
                 }
 
-            # Meetings COMPLÉTÉS concernant ce pôle
-            all_completed = (
-                session.query(Meeting)
-                .filter(
-                    Meeting.date >= since,
-                    Meeting.date <= datetime.utcnow(),
-                    Meeting.is_completed == True,
-                    Meeting.attendance_validated == True,
-                )
-                .all()
-            )
-
-            relevant_completed = []
-            for meeting in all_completed:
-                target_roles = meeting.get_target_roles()
-                if "ALL" in target_roles or role in target_roles:
-                    relevant_completed.append(meeting.id)
-
-            # Meetings À VENIR concernant ce pôle
-            upcoming = (
-                session.query(Meeting)
-                .filter(
-                    Meeting.date >= datetime.utcnow(), Meeting.is_completed == False
-                )
-                .all()
-            )
-
-            upcoming_count = 0
-            for meeting in upcoming:
-                target_roles = meeting.get_target_roles()
-                if "ALL" in target_roles or role in target_roles:
-                    upcoming_count += 1
-
-            # Calculer le taux de présence moyen sur les réunions complétées
-            total_rate = 0
+            # Réunions complétées et à venir concernant ce pôle
+            total_meetings = upcoming_count = 0
+            for target_roles, completed_count, upcoming_group in _meeting_groups(
+                session, completed, upcoming
+            ):
+                if _concerns_role(target_roles, role):
+                    total_meetings += completed_count
+                    upcoming_count += upcoming_group
+
+            # Présences des membres du pôle aux réunions complétées concernant ce
+            # pôle (mêmes réunions que le nombre de réunions attendues)
+            attended = {}
+            for member_id, target_roles, count in _attended_by_target(
+                session,
+                since_day,
+                today,
+                MemberAttendanceSummary.member_id.in_(select(Member.id).where(in_role)),
+            ):
+                if _concerns_role(target_roles, role):
+                    attended[member_id] = attended.get(member_id, 0) + int(count)
+
+            # Taux de présence de chaque membre sur les réunions complétées
             member_stats = []
-
-            for member in members:
-                stats = Database.get_member_stats(member.id, days)
-                total_rate += stats["rate"]
+            for member_id, full_name, username in members:
+                attended_count = attended.get(member_id, 0)
                 member_stats.append(
                     {
-                        "member": member.full_name or member.username,
-                        "rate": stats["rate"],
-                        "attended": stats["attended"],
+                        "member": full_name or username,
+                        "rate": (
+                            attended_count / total_meetings * 100
+                            if total_meetings > 0
+                            else 0
+                        ),
+                        "attended": attended_count,
                     }
                 )
 
@@ -716,95 +1807,75 @@ class Database:
             return {
                 "role": role,
                 "members_count": len(members),
-                "avg_attendance_rate": total_rate / len(members) if members else 0,
-                "total_meetings": len(relevant_completed),
+                "avg_attendance_rate": sum(m["rate"] for m in member_stats)
+                / len(members),
+                "total_meetings": total_meetings,
                 "upcoming_meetings": upcoming_count,
                 "top_members": member_stats[:5],  # Top 5
             }
 
     @staticmethod
+    @_stats_cached
     def get_global_stats(days=30):
         """Statistiques globales du laboratoire"""
         with get_session() as session:
-            since = datetime.utcnow() - timedelta(days=days)
+            now = datetime.utcnow()
+            since_day, today, completed = _stats_window(days)
 
-            # Total membres actifs
-            active_members = (
-                session.query(Member)
+            # Histogramme des membres actifs par pôle
+            members_by_role = dict(
+                session.query(Member.role, func.count(Member.id))
                 .filter(Member.status == MemberStatus.ACTIVE)
-                .count()
+                .group_by(Member.role)
+                .all()
             )
+            active_members = sum(members_by_role.values())
 
-            # Total réunions COMPLÉTÉES ET VALIDÉES
-            total_completed = (
-                session.query(Meeting)
+            # Réunions COMPLÉTÉES ET VALIDÉES regroupées par ensemble de rôles ciblés
+            completed_groups = (
+                session.query(Meeting.target_roles, func.count(Meeting.id))
+                .filter(completed)
+                .group_by(Meeting.target_roles)
+                .all()
+            )
+
+            # Présences sur la période lues dans le résumé journalier
+            total_attendances = (
+                session.query(func.coalesce(func.sum(MemberAttendanceSummary.count), 0))
                 .filter(
-                    Meeting.date >= since,
-                    Meeting.date <= datetime.utcnow(),
-                    Meeting.is_completed == True,
-                    Meeting.attendance_validated == True,
+                    MemberAttendanceSummary.status == "present",
+                    MemberAttendanceSummary.day >= since_day,
+                    MemberAttendanceSummary.day <= today,
                 )
-                .count()
+                .scalar()
             )
 
             # Total réunions À VENIR
             total_upcoming = (
                 session.query(Meeting)
-                .filter(
-                    Meeting.date >= datetime.utcnow(), Meeting.is_completed == False
-                )
+                .filter(Meeting.date >= now, Meeting.is_completed == False)
                 .count()
             )
 
             # Calcul du taux de participation global sur les réunions complétées
-            if total_completed > 0:
-                completed_meetings = (
-                    session.query(Meeting)
-                    .filter(
-                        Meeting.date >= since,
-                        Meeting.date <= datetime.utcnow(),
-                        Meeting.is_completed == True,
-                        Meeting.attendance_validated == True,
-                    )
-                    .all()
-                )
-
-                total_attendances = 0
-                total_expected_attendances = 0
-
-                for meeting in completed_meetings:
-                    target_roles = meeting.get_target_roles()
-                    if "ALL" in target_roles:
-                        expected = active_members
-                    else:
-                        expected = (
-                            session.query(Member)
-                            .filter(
-                                Member.role.in_(target_roles),
-                                Member.status == MemberStatus.ACTIVE,
-                            )
-                            .count()
-                        )
-
-                    actual = (
-                        session.query(Attendance)
-                        .filter(
-                            Attendance.meeting_id == meeting.id,
-                            Attendance.status == "present",
-                        )
-                        .count()
-                    )
-
-                    total_attendances += actual
-                    total_expected_attendances += expected
-
-                global_rate = (
-                    (total_attendances / total_expected_attendances * 100)
-                    if total_expected_attendances > 0
-                    else 0
-                )
-            else:
-                global_rate = 0
+            total_completed = 0
+            total_expected_attendances = 0
+
+            for target_roles, meetings_count in completed_groups:
+                roles = Meeting.parse_target_roles(target_roles)
+                if "ALL" in roles:
+                    expected = active_members
+                else:
+                    expected = sum(members_by_role.get(r, 0) for r in set(roles))
+
+                total_completed += meetings_count
+                total_expected_attendances += expected * meetings_count
+
+            global_rate = (
+                (total_attendances / total_expected_attendances * 100)
+                if total_expected_attendances > 0
+                else 0
+            )
 
             return {
                 "active_members": active_members,
@@ -813,3 +1884,100 @@ class Database:
                 "global_attendance_rate": global_rate,
                 "period_days": days,
             }
+
+
+# Unité de travail en cours : (session asynchrone, verrou des appels)
+_current_unit = ContextVar("current_unit", default=None)
+
+
+# Unité de travail d'une commande : les appels AsyncDatabase du bloc partagent
+# une seule session (une connexion du pool) et sont validés par un seul commit
+# à la sortie, ou annulés ensemble en cas d'erreur.
+# Ne pas attendre Discord dans le bloc : la connexion reste réservée.
+@asynccontextmanager
+async def unit_of_work():
+    current = _current_unit.get()
+    if current is not None:
+        # Bloc imbriqué : rattaché à l'unité englobante
+        yield current[0]
+        return
+
+    async with AsyncSession() as session:
+        token = _current_unit.set((session, asyncio.Lock()))
+        try:
+            yield session
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Erreur DB: {e}")
+            raise
+        finally:
+            _current_unit.reset(token)
+
+
+# Exécute une méthode synchrone de Database sur une session asynchrone (asyncpg)
+# Les allers-retours réseau sont attendus sans bloquer la boucle d'événements
+# Dans une unité de travail (ou avec session=...), l'appelant valide la session
+async def run_async(func, *args, session=None, **kwargs):
+    def _call(sync_session):
+        token = _current_session.set(sync_session)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current_session.reset(token)
+
+    if session is not None:
+        return await session.run_sync(_call)
+
+    unit = _current_unit.get()
+    if unit is not None:
+        unit_session, lock = unit
+        # Une session ne supporte pas d'appels concurrents (asyncio.gather)
+        async with lock:
+            return await unit_session.run_sync(_call)
+
+    async with AsyncSession() as session:
+        try:
+            result = await session.run_sync(_call)
+            await session.commit()
+            return result
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Erreur DB: {e}")
+            raise
+
+
+def _make_async(func):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run_async(func, *args, **kwargs)
+
+    return staticmethod(wrapper)
+
+
+# Les méthodes de Database acceptent une session optionnelle (session=...) :
+# elles s'exécutent alors dans cette session, validée par l'appelant
+def _accepts_session(func):
+    @functools.wraps(func)
+    def wrapper(*args, session=None, **kwargs):
+        if session is None:
+            return func(*args, **kwargs)
+        token = _current_session.set(session)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current_session.reset(token)
+
+    return staticmethod(wrapper)
+
+
+# Version asynchrone de Database, à utiliser depuis les cogs et les vues
+# Même interface que Database, chaque méthode doit être attendue (await)
+class AsyncDatabase:
+    pass
+
+
+for _name, _attr in list(vars(Database).items()):
+    if isinstance(_attr, staticmethod):
+        setattr(Database, _name, _accepts_session(_attr.__func__))
+        setattr(AsyncDatabase, _name, _make_async(_attr.__func__))
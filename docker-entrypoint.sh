@@ -67,6 +67,14 @@ if [ $? -ne 0 ]; then
     exit 1
 fi
 
+# Appliquer les migrations (index créés sans bloquer les écritures)
+echo ""
+echo "📦 Migrations du schéma..."
+if ! python migrations.py upgrade; then
+    echo "❌ Échec des migrations"
+    exit 1
+fi
+
 # Vérifier la connexion Discord
 echo ""
 echo "🔍 Vérification du token Discord..."
@@ -0,0 +1,105 @@
+# Surveillance de la boucle d'évènements (loop_watchdog.py)
+#
+# Une tâche asyncio se réveille toutes les INTERVAL secondes et mesure son retard
+# (lag) : un retard important signifie que la boucle a été bloquée par du code
+# synchrone (requête Database appelée hors asyncio.to_thread, calcul lourd...).
+# Un thread d'échantillonnage capture la pile du thread principal pendant le
+# blocage pour retrouver le cog, la commande et la méthode Database en cause.
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import traceback
+from collections import deque
+from datetime import datetime
+from time import monotonic
+
+logger = logging.getLogger(__name__)
+
+# Période de mesure (secondes)
+INTERVAL = 0.1
+
+
+class LoopWatchdog:
+
+    def __init__(self, threshold_ms, history=20):
+        self.threshold = threshold_ms / 1000
+        self.stalls = deque(maxlen=history)  # derniers blocages détectés
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._heartbeat = monotonic()
+        self._sample = None  # pile capturée pendant le blocage en cours
+        self._thread_id = None
+        self._task = None
+        self._stopped = threading.Event()
+
+    # Démarre la tâche de mesure et le thread d'échantillonnage (depuis la boucle)
+    def start(self):
+        self._thread_id = threading.get_ident()
+        self._heartbeat = monotonic()
+        self._task = asyncio.create_task(self._run(), name="loop-watchdog")
+        threading.Thread(
+            target=self._sampler, name="loop-watchdog", daemon=True
+        ).start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._task:
+            self._task.cancel()
+
+    async def _run(self):
+        while True:
+            self._sample = None
+            self._heartbeat = start = monotonic()
+            await asyncio.sleep(INTERVAL)
+            lag = monotonic() - start - INTERVAL
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.threshold:
+                self._record(lag, self._sample)
+
+    # Thread : capture la pile du thread principal dès que le seuil est dépassé
+    def _sampler(self):
+        while not self._stopped.wait(INTERVAL):
+            blocked = monotonic() - self._heartbeat - INTERVAL
+            if blocked < self.threshold or self._sample is not None:
+                continue
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self._sample = traceback.extract_stack(frame)
+
+    def _record(self, lag, stack):
+        stall = {
+            "at": datetime.utcnow(),
+            "lag_ms": lag * 1000,
+            **_describe(stack),
+            "stack": traceback.format_list(stack[-8:]) if stack else [],
+        }
+        self.stalls.append(stall)
+        logger.warning(
+            f"🐌 Boucle bloquée {stall['lag_ms']:.0f} ms "
+            f"(cog: {stall['cog'] or '?'}, commande: {stall['command'] or '?'}, "
+            f"Database: {stall['database'] or '-'})"
+        )
+
+    # Blocages les plus longs parmi les derniers détectés
+    def worst(self, limit=5):
+        return sorted(self.stalls, key=lambda s: s["lag_ms"], reverse=True)[:limit]
+
+
+# Retrouve dans la pile le cog (ou la vue), sa fonction et la méthode Database
+def _describe(stack):
+    from database import Database
+
+    cog = command = database = None
+    for frame in stack or []:
+        path = frame.filename.replace(os.sep, "/")
+        for folder in ("/cogs/", "/views/"):
+            if folder in path:
+                cog = folder.strip("/") + "/" + path.split(folder, 1)[1][:-3]
+                command = frame.name
+        if path.endswith("/database.py") and frame.name in vars(Database):
+            database = frame.name
+    return {"cog": cog, "command": command, "database": database}
@@ -1,11 +1,25 @@
 ## Fichier principal (main.py)
 
 import discord
+from discord import app_commands
 from discord.ext import commands
 import logging
 import asyncio
+import hashlib
+import json
 import os
+from time import perf_counter
 from dotenv import load_dotenv
+from config import (
+    COMMAND_SYNC_GUILD,
+    FORCE_COMMAND_SYNC,
+    GUILD_ID,
+    LOOP_LAG_THRESHOLD_MS,
+)
+from database import AsyncDatabase
+from loop_watchdog import LoopWatchdog
+from models import dispose_async_engine
+from metrics import start_metrics_server, time_interaction
 
 # Charger les variables d'environnement
 load_dotenv()
@@ -27,44 +41,155 @@ intents.message_content = True
 intents.members = True
 
 
+# Noms des extensions (ex: cogs.admin.clear) trouvées récursivement dans folder
+def find_extensions(folder):
+    extensions = []
+    for root, dirs, files in os.walk(folder):
+        for filename in sorted(files):
+            # Ignorer les fichiers non Python, __init__.py et is_admin.py
+            if not filename.endswith(".py") or filename in (
+                "__init__.py",
+                "is_admin.py",
+            ):
+                continue
+            rel_dir = os.path.relpath(root, ".")
+            extensions.append(f"{rel_dir.replace(os.sep, '.')}.{filename[:-3]}")
+    return extensions
+
+
+# Arbre des commandes slash : chaque commande de tous les cogs est chronométrée
+# et ses requêtes SQL comptées depuis interaction_check, appelé avant la
+# commande (voir /debug_queries et metrics.py)
+class LCSPCommandTree(app_commands.CommandTree):
+
+    async def interaction_check(self, interaction):
+        if interaction.type is discord.InteractionType.application_command:
+            time_interaction(f"/{interaction.data.get('name')}")
+        return True
+
+
 # Bot Administratif LCSP
 class LCSPBot(commands.Bot):
 
     def __init__(self):
         super().__init__(
-            command_prefix="!", intents=intents, description="Bot administratif LCSP"
+            command_prefix="!",
+            intents=intents,
+            description="Bot administratif LCSP",
+            tree_cls=LCSPCommandTree,
         )
+        self.metrics_runner = None
+        self.cog_setup_times = {}
+        # Détection des blocages de la boucle d'évènements (voir /debug_loop)
+        self.loop_watchdog = LoopWatchdog(LOOP_LAG_THRESHOLD_MS)
 
     # Initialisation du bot
     async def setup_hook(self):
-        # Charger récursivement les cogs dans ./cogs et ses sous-dossiers
-        for root, dirs, files in os.walk("./cogs"):
-            for filename in files:
-                if not filename.endswith(".py"):
-                    continue
-                # ignorer le fichier is_admin.py
-                if filename == "is_admin.py":
-                    continue
-                module_name = filename[:-3]
-                # Ignorer les __init__.py
-                if module_name == "__init__":
-                    continue
-                # Construire le nom d'extension en dotted path (ex: cogs.admin.clear)
-                rel_dir = os.path.relpath(root, ".")
-                dotted_dir = rel_dir.replace(os.sep, ".")
-                cog_name = f"{dotted_dir}.{module_name}"
-                try:
-                    await self.load_extension(cog_name)
-                    logger.info(f"✅ Cog chargé: {cog_name}")
-                except Exception as e:
-                    logger.error(f"❌ Erreur de chargement du cog {cog_name}: {e}")
+        self.loop_watchdog.start()
+
+        # Endpoint des métriques et du healthcheck
+        try:
+            self.metrics_runner = await start_metrics_server(self)
+        except OSError as e:
+            logger.error(f"❌ Serveur de métriques indisponible: {e}")
+
+        # Charger les cogs de ./cogs, avec leur durée de chargement
+        started = perf_counter()
+        extensions = find_extensions("./cogs")
+        loaded = 0
+        for name in extensions:
+            loaded += await self.load_cog(name)
+        logger.info(
+            f"📦 {loaded}/{len(extensions)} cogs chargés en "
+            f"{(perf_counter() - started) * 1000:.0f} ms"
+        )
 
         # Synchroniser les commandes slash
+        await self.sync_commands()
+
+    # Charge une extension et journalise sa durée d'import et de setup
+    async def load_cog(self, name):
+        started = perf_counter()
+        try:
+            await self.load_extension(name)
+        except Exception as e:
+            logger.error(f"❌ Erreur de chargement du cog {name}: {e}")
+            return False
+        total = (perf_counter() - started) * 1000
+        setup = self.cog_setup_times.get(name, 0.0)
+        logger.info(
+            f"✅ Cog chargé: {name} "
+            f"(import {total - setup:.1f} ms, setup {setup:.1f} ms)"
+        )
+        return True
+
+    # Durée du setup de chaque extension (ajout du cog et de ses commandes)
+    async def add_cog(self, cog, *args, **kwargs):
+        started = perf_counter()
+        await super().add_cog(cog, *args, **kwargs)
+        self.cog_setup_times[cog.__module__] = (
+            self.cog_setup_times.get(cog.__module__, 0.0)
+            + (perf_counter() - started) * 1000
+        )
+
+    # Synchronise l'arbre des commandes avec Discord, seulement s'il a changé
+    # depuis la dernière synchronisation (empreinte stockée en base par portée)
+    async def sync_commands(self):
+        scopes = [None]
+        if GUILD_ID:
+            guild = discord.Object(id=GUILD_ID)
+            if COMMAND_SYNC_GUILD:
+                # Commandes copiées sur le serveur : visibles immédiatement. Les
+                # commandes globales sont vidées pour ne pas apparaître en double
+                self.tree.copy_global_to(guild=guild)
+                self.tree.clear_commands(guild=None)
+                scopes = [guild, None]
+            else:
+                # Retirer les commandes d'une ancienne synchronisation sur le serveur
+                self.tree.clear_commands(guild=guild)
+                scopes = [None, guild]
+
+        db = AsyncDatabase()
+        for guild in scopes:
+            await self._sync_scope(db, guild)
+
+    # Synchronise une portée (serveur ou globale) si son empreinte a changé
+    async def _sync_scope(self, db, guild):
+        scope = str(guild.id) if guild else "global"
+        commands_data = [c.to_dict() for c in self.tree.get_commands(guild=guild)]
+        tree_hash = hashlib.sha256(
+            json.dumps(commands_data, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
         try:
-            synced = await self.tree.sync()
-            logger.info(f"🔄 {len(synced)} commandes synchronisées")
+            synced_hash = await db.get_command_tree_hash(scope)
+        except Exception as e:
+            logger.error(f"❌ Empreinte des commandes illisible: {e}")
+            synced_hash = None
+
+        if synced_hash == tree_hash and not FORCE_COMMAND_SYNC:
+            logger.info(f"⏭️ Commandes inchangées ({scope}), synchronisation ignorée")
+            return
+
+        try:
+            synced = await self.tree.sync(guild=guild)
+            logger.info(f"🔄 {len(synced)} commandes synchronisées ({scope})")
         except Exception as e:
             logger.error(f"❌ Erreur synchronisation: {e}")
+            return
+
+        try:
+            await db.set_command_tree_hash(scope, tree_hash)
+        except Exception as e:
+            logger.error(f"❌ Empreinte des commandes non enregistrée: {e}")
+
+    # Fermeture du bot : libérer les connexions du pool asynchrone
+    async def close(self):
+        await super().close()
+        self.loop_watchdog.stop()
+        if self.metrics_runner:
+            await self.metrics_runner.cleanup()
+        await dispose_async_engine()
 
     # Evènement de démarrage quand le bot est prêt
     async def on_ready(self):
@@ -0,0 +1,238 @@
+# Métriques du bot au format Prometheus (metrics.py)
+#
+# Chaque commande slash et chaque callback de vue est chronométré :
+#   - délai avant la première réponse (defer, send_message, edit_message...)
+#   - délai avant le premier followup (message envoyé ou réponse éditée)
+#   - durée totale du traitement
+# Les histogrammes sont exposés avec l'état du pool de connexions et la latence
+# de la gateway sur http://METRICS_HOST:METRICS_PORT/metrics (/health pour Docker).
+
+import asyncio
+import functools
+import logging
+import math
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter
+import discord
+from aiohttp import web
+from config import METRICS_HOST, METRICS_PORT
+from models import close_query_scope, engines, open_query_scope
+
+logger = logging.getLogger(__name__)
+
+# Bornes des histogrammes (secondes), Discord exige une réponse en moins de 3 s
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 30.0)
+
+
+# Histogramme cumulatif par valeur de label (type Prometheus "histogram")
+class Histogram:
+
+    def __init__(self, name, help, label, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label = label
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series = {}  # label -> [compteurs par borne + Inf, somme]
+
+    def observe(self, label_value, value):
+        with self._lock:
+            series = self._series.setdefault(
+                label_value, [[0] * (len(self.buckets) + 1), 0.0]
+            )
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted(self._series.items())
+            for label_value, (counts, total) in series:
+                label = f'{self.label}="{_escape(label_value)}"'
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    lines.append(
+                        f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}'
+                    )
+                cumulative += counts[-1]
+                lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {cumulative}')
+                lines.append(f"{self.name}_sum{{{label}}} {total}")
+                lines.append(f"{self.name}_count{{{label}}} {cumulative}")
+        return lines
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+defer_latency = Histogram(
+    "lcsp_interaction_defer_seconds",
+    "Délai avant la première réponse à l'interaction",
+    "command",
+)
+followup_latency = Histogram(
+    "lcsp_interaction_first_followup_seconds",
+    "Délai avant le premier followup de l'interaction",
+    "command",
+)
+total_latency = Histogram(
+    "lcsp_interaction_duration_seconds",
+    "Durée totale du traitement de l'interaction",
+    "command",
+)
+
+
+# Chronométrage de l'interaction en cours (posé par time_interaction)
+_current_timing = ContextVar("interaction_timing", default=None)
+
+
+class InteractionTiming:
+
+    def __init__(self, name):
+        self.name = name
+        self.start = perf_counter()
+        self.responded = False
+        self.followed_up = False
+
+    def response(self):
+        if not self.responded:
+            self.responded = True
+            defer_latency.observe(self.name, perf_counter() - self.start)
+
+    def followup(self):
+        if not self.followed_up:
+            self.followed_up = True
+            followup_latency.observe(self.name, perf_counter() - self.start)
+
+
+# Enveloppe une méthode publique de discord.py pour noter, une fois l'appel
+# réussi, la réponse ou le followup de l'interaction en cours
+def _timed(method, mark):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        result = await method(*args, **kwargs)
+        timing = _current_timing.get()
+        if timing is not None:
+            mark(timing)
+        return result
+
+    return wrapper
+
+
+# Première réponse : méthodes de InteractionResponse ; premier followup :
+# interaction.followup.send (Webhook.send) ou édition de la réponse d'origine
+# (Interaction.edit_original_response, aussi utilisée par InteractionMessage.edit)
+for _method in ("defer", "send_message", "edit_message", "send_modal"):
+    setattr(
+        discord.InteractionResponse,
+        _method,
+        _timed(
+            getattr(discord.InteractionResponse, _method), InteractionTiming.response
+        ),
+    )
+discord.Webhook.send = _timed(discord.Webhook.send, InteractionTiming.followup)
+discord.Interaction.edit_original_response = _timed(
+    discord.Interaction.edit_original_response, InteractionTiming.followup
+)
+
+
+# Chronomètre l'interaction traitée par la tâche courante et compte ses
+# requêtes SQL jusqu'à la fin de la tâche. Appelé depuis interaction_check
+# (hook public) : discord.py traite chaque commande slash, callback de vue et
+# envoi de modal dans sa propre tâche, qui se termine avec le traitement
+def time_interaction(name):
+    task = asyncio.current_task()
+    if task is None:
+        return
+    timing = InteractionTiming(name)
+    _current_timing.set(timing)
+    scope = open_query_scope(name)
+
+    def finish(task):
+        total_latency.observe(name, perf_counter() - timing.start)
+        close_query_scope(scope)
+
+    task.add_done_callback(finish)
+
+
+# Vues et modals dont les callbacks sont chronométrés (même rôle que
+# LCSPCommandTree pour les commandes slash). Une sous-classe qui redéfinit
+# interaction_check doit appeler super().interaction_check
+class TimedView(discord.ui.View):
+
+    async def interaction_check(self, interaction):
+        custom_id = (interaction.data or {}).get("custom_id")
+        item = next(
+            (i for i in self.children if getattr(i, "custom_id", None) == custom_id),
+            None,
+        )
+        # Les callbacks décorés (@discord.ui.button) sont enveloppés par discord.py
+        callback = getattr(item.callback, "callback", item.callback) if item else None
+        name = getattr(callback, "__name__", type(item).__name__)
+        time_interaction(f"{type(self).__name__}.{name}")
+        return True
+
+
+class TimedModal(discord.ui.Modal):
+
+    async def interaction_check(self, interaction):
+        time_interaction(type(self).__name__)
+        return True
+
+
+def _pool_checked_out(target):
+    checkedout = getattr(target.pool, "checkedout", None)
+    return checkedout() if checkedout else 0
+
+
+# Texte Prometheus de toutes les métriques
+def render_metrics(bot):
+    latency = bot.latency
+    lines = [
+        "# HELP lcsp_gateway_latency_seconds Latence de la gateway Discord",
+        "# TYPE lcsp_gateway_latency_seconds gauge",
+        f"lcsp_gateway_latency_seconds {'NaN' if math.isinf(latency) else latency}",
+        "# HELP lcsp_db_pool_checked_out Connexions du pool actuellement utilisées",
+        "# TYPE lcsp_db_pool_checked_out gauge",
+    ]
+    # Seuls les engines déjà créés (à la première requête) sont listés
+    for kind, target in sorted(engines.items()):
+        lines.append(
+            f'lcsp_db_pool_checked_out{{engine="{kind}"}} {_pool_checked_out(target)}'
+        )
+    watchdog = getattr(bot, "loop_watchdog", None)
+    if watchdog:
+        lines += [
+            "# HELP lcsp_event_loop_lag_seconds Dernier retard mesuré de la boucle",
+            "# TYPE lcsp_event_loop_lag_seconds gauge",
+            f"lcsp_event_loop_lag_seconds {watchdog.last_lag}",
+        ]
+    for histogram in (defer_latency, followup_latency, total_latency):
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
+
+
+# Serveur HTTP local (/metrics et /health), retourne le runner à arrêter
+async def start_metrics_server(bot):
+    async def metrics(request):
+        return web.Response(
+            text=render_metrics(bot), content_type="text/plain", charset="utf-8"
+        )
+
+    async def health(request):
+        # Sain tant que le bot est connecté à la gateway
+        if bot.is_closed() or not bot.is_ready() or math.isinf(bot.latency):
+            return web.Response(status=503, text="starting\n")
+        return web.Response(text="ok\n")
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics)
+    app.router.add_get("/health", health)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, METRICS_HOST, METRICS_PORT).start()
+    logger.info(f"📈 Métriques sur http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+    return runner
@@ -0,0 +1,354 @@
+# Migrations versionnées du schéma (migrations.py)
+#
+# Utilisation :
+#   python migrations.py upgrade   applique les migrations manquantes
+#   python migrations.py status    liste les migrations et leur état
+#   python migrations.py check     index manquants + EXPLAIN des requêtes (Postgres)
+#
+# Les index sont créés avec CREATE INDEX CONCURRENTLY sur Postgres : pas de
+# verrou bloquant les écritures, la migration peut tourner sur une base en service.
+
+import json
+import sys
+from datetime import datetime
+from sqlalchemy import event, inspect, text
+from models import Session, engine
+
+
+# Supprime les présences en double avant la création de l'index unique
+def _dedupe_attendances(conn):
+    from models import dedupe_attendances
+
+    dedupe_attendances()
+
+
+# Supprime l'ancien résumé des présences (membre, jour, statut), remplacé par
+# member_attendance_by_target (rempli au démarrage par init_database)
+def _drop_attendance_summary(conn):
+    conn.execute(text("DROP TABLE IF EXISTS member_attendance_summary"))
+    print("   🗑️ member_attendance_summary")
+
+
+# Index à créer : (nom, table, colonnes, condition d'index partiel[, options])
+# options : unique, using (méthode d'index), dialect (moteur concerné uniquement)
+# Une étape peut aussi être une fonction appelée avec la connexion
+# Chaque migration est (version, description, étapes)
+MIGRATIONS = [
+    (
+        1,
+        "Index composites des filtres des statistiques et des tickets",
+        [
+            (
+                "ix_meetings_date_completed_validated",
+                "meetings",
+                "date, is_completed, attendance_validated",
+                None,
+            ),
+            (
+                "ix_attendances_meeting_status",
+                "attendances",
+                "meeting_id, status",
+                None,
+            ),
+            ("ix_attendances_member_status", "attendances", "member_id, status", None),
+            ("ix_members_status_role", "members", "status, role", None),
+            ("ix_tickets_status_created_at", "tickets", "status, created_at", None),
+        ],
+    ),
+    (
+        2,
+        "Index couvrants des statistiques des tickets (/ticket_stats)",
+        [
+            # GROUP BY status, type, pole_requested lu dans l'index seul
+            (
+                "ix_tickets_status_type_pole",
+                "tickets",
+                "status, type, pole_requested",
+                None,
+            ),
+            # Tickets ouverts par semaine
+            ("ix_tickets_created_at", "tickets", "created_at", None),
+            # Tickets fermés par semaine et délai médian de fermeture
+            (
+                "ix_tickets_closed_at_created_at",
+                "tickets",
+                "closed_at, created_at, status",
+                "closed_at IS NOT NULL",
+            ),
+        ],
+    ),
+    (
+        3,
+        "Index de la pagination keyset des tickets ouverts (/ticket_list)",
+        [
+            # Tickets ouverts uniquement (liste des tickets, ticket ouvert d'un
+            # membre) ; ORDER BY created_at, id lu dans l'ordre de l'index, sans tri
+            (
+                "ix_tickets_open_created_at_id",
+                "tickets",
+                "created_at, id",
+                "status = 'OPEN'",
+            ),
+        ],
+    ),
+    (
+        4,
+        "Index des réunions à venir (/meetings, /stats_pole)",
+        [
+            ("ix_meetings_upcoming_date", "meetings", "date", "is_completed = false"),
+        ],
+    ),
+    (
+        5,
+        "Index unique des présences et index trigrammes de la recherche de membres",
+        [
+            _dedupe_attendances,
+            (
+                "uq_attendances_meeting_member",
+                "attendances",
+                "meeting_id, member_id",
+                None,
+                {"unique": True},
+            ),
+            (
+                "ix_meeting_target_roles_role_meeting",
+                "meeting_target_roles",
+                "role, meeting_id",
+                None,
+            ),
+        ]
+        + [
+            (
+                f"ix_members_{column}_trgm",
+                "members",
+                f"{column} gin_trgm_ops",
+                None,
+                {"using": "gin", "dialect": "postgresql"},
+            )
+            for column in ("full_name", "username", "email")
+        ],
+    ),
+    (
+        6,
+        "Suppression du résumé des présences sans les rôles ciblés",
+        [_drop_attendance_summary],
+    ),
+]
+
+
+# Table de suivi des migrations appliquées
+def _ensure_version_table(conn):
+    conn.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version INTEGER PRIMARY KEY, "
+            "description VARCHAR(200), "
+            "applied_at TIMESTAMP)"
+        )
+    )
+
+
+def _applied_versions(conn):
+    _ensure_version_table(conn)
+    return {
+        row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))
+    }
+
+
+# Un CREATE INDEX CONCURRENTLY interrompu laisse un index invalide : le supprimer
+# pour pouvoir le recréer
+def _drop_invalid_index(conn, name):
+    invalid = conn.execute(
+        text(
+            "SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {"name": name},
+    ).first()
+    if invalid:
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+
+# Étapes de type index d'une migration qui concernent ce moteur
+def _indexes(steps, dialect):
+    for step in steps:
+        if callable(step):
+            continue
+        name, table, columns, where, *options = step
+        options = options[0] if options else {}
+        if options.get("dialect", dialect) == dialect:
+            yield name, table, columns, where, options
+
+
+def _create_index(conn, name, table, columns, where, options):
+    postgres = conn.dialect.name == "postgresql"
+    if postgres:
+        _drop_invalid_index(conn, name)
+    unique = "UNIQUE " if options.get("unique") else ""
+    using = f"USING {options['using']} " if options.get("using") else ""
+    sql = (
+        f"CREATE {unique}INDEX {'CONCURRENTLY ' if postgres else ''}IF NOT EXISTS "
+        f"{name} ON {table} {using}({columns})"
+    )
+    if where:
+        sql += f" WHERE {where}"
+    conn.execute(text(sql))
+
+
+# Applique les migrations manquantes, dans l'ordre des versions
+def upgrade():
+    # CONCURRENTLY est interdit dans une transaction : mode autocommit
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        applied = _applied_versions(conn)
+        for version, description, steps in MIGRATIONS:
+            if version in applied:
+                continue
+            print(f"⏳ Migration {version}: {description}")
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                    continue
+                for name, table, columns, where, options in _indexes(
+                    [step], conn.dialect.name
+                ):
+                    _create_index(conn, name, table, columns, where, options)
+                    print(f"   ✅ {name}")
+            conn.execute(
+                text(
+                    "INSERT INTO schema_migrations (version, description, applied_at) "
+                    "VALUES (:version, :description, :applied_at)"
+                ),
+                {
+                    "version": version,
+                    "description": description,
+                    "applied_at": datetime.utcnow(),
+                },
+            )
+    print("✅ Schéma à jour")
+    return True
+
+
+def status():
+    with engine.connect() as conn:
+        applied = _applied_versions(conn)
+        conn.commit()
+    for version, description, _ in MIGRATIONS:
+        state = "✅" if version in applied else "⏳"
+        print(f"{state} {version}: {description}")
+    return True
+
+
+# Requêtes représentatives des commandes du bot, exécutées pour capturer leur SQL
+def _sample_queries():
+    from database import Database
+    from models import Meeting, Member, MemberStatus
+
+    with Session() as session:
+        member = session.query(Member.id, Member.role).first()
+        meeting_id = session.query(Meeting.id).order_by(Meeting.id.desc()).scalar()
+        member_ids = [row.id for row in session.query(Member.id).limit(50)]
+
+    calls = [
+        (Database.get_global_stats, (30,)),
+        (Database.get_role_stats, ("DEV", 30)),
+        (Database.get_members_stats, (member_ids, 30)),
+        (Database.get_upcoming_meetings, (5, "DEV")),
+        (Database.get_all_members, (MemberStatus.ACTIVE, "DEV")),
+        (Database.search_members, ("lcsp", 10)),
+        (Database.get_open_tickets_page, (5,)),
+        (Database.count_open_tickets, ()),
+        (Database.get_user_open_ticket, ("0",)),
+        (Database.get_ticket_stats, ()),
+    ]
+    if member:
+        calls.append((Database.get_member_upcoming_meetings, (member.id,)))
+    if meeting_id:
+        calls.append((Database.get_meeting_stats, (meeting_id,)))
+        calls.append((Database.get_meeting_attendance, (meeting_id,)))
+    return calls
+
+
+# Parcourt un plan EXPLAIN (JSON) et retourne les tables lues en Seq Scan
+def _seq_scans(plan):
+    scans = []
+    if plan.get("Node Type") == "Seq Scan":
+        scans.append((plan.get("Relation Name"), plan.get("Plan Rows")))
+    for child in plan.get("Plans", []):
+        scans.extend(_seq_scans(child))
+    return scans
+
+
+# Signale les index de MIGRATIONS absents, puis lance EXPLAIN sur les requêtes
+# de Database et liste celles qui parcourent des tables entières
+def check():
+    import database
+
+    ok = True
+    existing = {}
+    inspector = inspect(engine)
+    for version, _, steps in MIGRATIONS:
+        for name, table, _, _, _ in _indexes(steps, engine.dialect.name):
+            if table not in existing:
+                existing[table] = {i["name"] for i in inspector.get_indexes(table)}
+            if name not in existing[table]:
+                ok = False
+                print(f"❌ Index manquant: {name} sur {table} (migration {version})")
+
+    if engine.dialect.name != "postgresql":
+        print("⚠️ EXPLAIN n'est vérifié que sur Postgres")
+        return ok
+
+    # Capturer les SELECT émis par chaque méthode, sans rien modifier (rollback)
+    captured = []
+    current = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            captured.append((current[-1], statement, parameters))
+
+    calls = _sample_queries()
+    session = Session()
+    event.listen(engine, "before_cursor_execute", capture)
+    token = database._current_session.set(session)
+    try:
+        for func, args in calls:
+            current.append(func.__name__)
+            database.stats_cache.clear()
+            func(*args)
+    finally:
+        database._current_session.reset(token)
+        event.remove(engine, "before_cursor_execute", capture)
+        session.rollback()
+        database.stats_cache.clear()
+
+    # EXPLAIN de chaque requête capturée
+    try:
+        cursor = session.connection().connection.cursor()
+        for name, statement, parameters in captured:
+            cursor.execute("EXPLAIN (FORMAT JSON) " + statement, parameters)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            scans = _seq_scans(plan[0]["Plan"])
+            if scans:
+                tables = ", ".join(f"{table} (~{rows} lignes)" for table, rows in scans)
+                print(f"⚠️ {name}: Seq Scan sur {tables}")
+                print(f"   {' '.join(statement.split())[:200]}")
+            else:
+                print(f"✅ {name}: index utilisés")
+        cursor.close()
+    finally:
+        session.rollback()
+        session.close()
+
+    print(f"📊 {len(captured)} requête(s) analysée(s)")
+    return ok
+
+
+if __name__ == "__main__":
+    commands = {"upgrade": upgrade, "status": status, "check": check}
+    command = sys.argv[1] if len(sys.argv) > 1 else "upgrade"
+    if command not in commands:
+        print(f"Usage: python migrations.py [{'|'.join(commands)}]")
+        sys.exit(2)
+    sys.exit(0 if commands[command]() else 1)
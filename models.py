@@ -3,22 +3,37 @@ from sqlalchemy import (
     Column,
     Integer,
     String,
+    Date,
     DateTime,
     Boolean,
     ForeignKey,
     Text,
     Enum,
+    Index,
+    PrimaryKeyConstraint,
+    event,
+    func,
+    insert,
+    inspect,
+    select,
 )
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import relationship, sessionmaker
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
+from time import perf_counter
 import enum
+import logging
+import re
 import sys
 import json
+import threading
 
 # Import config avec gestion d'erreur
 try:
-    from config import DATABASE_URL
+    from config import DATABASE_URL, ASYNC_DATABASE_URL, SLOW_QUERY_MS
 except ImportError:
     print("❌ Erreur: Impossible d'importer config.py")
     sys.exit(1)
@@ -28,20 +43,218 @@ if not DATABASE_URL:
     print("❌ Erreur: DATABASE_URL non configuré")
     sys.exit(1)
 
-# Créer l'engine avec gestion d'erreur
-try:
-    Base = declarative_base()
-    engine = create_engine(
-        DATABASE_URL,
-        pool_pre_ping=True,  # Vérifie la connexion avant de l'utiliser
-        pool_recycle=3600,  # Recycle les connexions après 1h
-        echo=False,  # Mettre à True pour debug
+Base = declarative_base()
+
+# Engines créés à la première utilisation ("sync" : psycopg2, "async" : asyncpg) :
+# importer models (comme le font tous les cogs) ne charge aucun driver
+engines = {}
+_engines_lock = threading.Lock()
+
+
+def _create_engine(kind):
+    with _engines_lock:
+        if kind in engines:
+            return engines[kind]
+        try:
+            if kind == "sync":
+                created = create_engine(
+                    DATABASE_URL,
+                    pool_pre_ping=True,  # Vérifie la connexion avant de l'utiliser
+                    pool_recycle=3600,  # Recycle les connexions après 1h
+                    echo=False,  # Mettre à True pour debug
+                )
+                instrumented = created
+            else:
+                # Engine asynchrone (asyncpg) utilisé par le bot (ne bloque pas la boucle)
+                created = create_async_engine(
+                    ASYNC_DATABASE_URL,
+                    pool_pre_ping=True,
+                    pool_recycle=3600,
+                    echo=False,
+                )
+                instrumented = created.sync_engine
+        except Exception as e:
+            print(f"❌ Erreur de connexion à la base de données: {e}")
+            raise
+        # Les deux engines sont instrumentés (voir query_scope)
+        event.listen(instrumented, "before_cursor_execute", _before_cursor_execute)
+        event.listen(instrumented, "after_cursor_execute", _after_cursor_execute)
+        engines[kind] = created
+        print(f"✅ Connexion à la base de données configurée ({kind})")
+        return created
+
+
+def get_engine():
+    return engines.get("sync") or _create_engine("sync")
+
+
+def get_async_engine():
+    return engines.get("async") or _create_engine("async")
+
+
+# Libère les connexions du pool asynchrone, s'il a été créé
+async def dispose_async_engine():
+    if "async" in engines:
+        await engines["async"].dispose()
+
+
+# models.engine et models.async_engine restent accessibles (créés à la demande)
+def __getattr__(name):
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Fabrique de sessions liée à son engine lors de la première session ouverte
+class _LazyBind:
+
+    def __init__(self, create_bind, **kw):
+        super().__init__(**kw)
+        self.create_bind = create_bind
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=self.create_bind())
+        return super().__call__(**local_kw)
+
+
+class _LazySessionmaker(_LazyBind, sessionmaker):
+    pass
+
+
+class _LazyAsyncSessionmaker(_LazyBind, async_sessionmaker):
+    pass
+
+
+Session = _LazySessionmaker(get_engine)
+AsyncSession = _LazyAsyncSessionmaker(get_async_engine, expire_on_commit=False)
+
+
+# --- Instrumentation des requêtes SQL ---
+# Chaque interaction ouvre un QueryScope (query_scope) : les requêtes émises
+# pendant son traitement y sont comptées, y compris depuis AsyncDatabase et
+# asyncio.to_thread qui héritent du contexte de la tâche. Les listeners sont
+# posés sur chaque engine à sa création.
+query_logger = logging.getLogger("LCSP_SQL")
+
+_current_query_scope = ContextVar("current_query_scope", default=None)
+
+
+# Requêtes émises pendant une interaction
+class QueryScope:
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.duration = 0.0  # ms passées en base
+        self.slow = []  # (durée ms, SQL normalisé)
+
+
+# Agrégats par commande depuis le démarrage du bot (/debug_queries)
+class QueryStats:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.commands = {}
+
+    def record(self, scope):
+        with self._lock:
+            entry = self.commands.setdefault(
+                scope.name,
+                {
+                    "calls": 0,
+                    "queries": 0,
+                    "max_queries": 0,
+                    "db_time": 0.0,
+                    "max_db_time": 0.0,
+                    "slow_queries": 0,
+                    "slowest": None,
+                },
+            )
+            entry["calls"] += 1
+            entry["queries"] += scope.count
+            entry["max_queries"] = max(entry["max_queries"], scope.count)
+            entry["db_time"] += scope.duration
+            entry["max_db_time"] = max(entry["max_db_time"], scope.duration)
+            entry["slow_queries"] += len(scope.slow)
+            for slow in scope.slow:
+                if entry["slowest"] is None or slow[0] > entry["slowest"][0]:
+                    entry["slowest"] = slow
+
+    # Commandes triées par temps maximal passé en base (ou nombre de requêtes)
+    def worst(self, limit=10, key="max_db_time"):
+        with self._lock:
+            items = [(name, dict(entry)) for name, entry in self.commands.items()]
+        items.sort(key=lambda item: item[1][key], reverse=True)
+        return items[:limit]
+
+    def clear(self):
+        with self._lock:
+            self.commands.clear()
+
+
+query_stats = QueryStats()
+
+
+# Ouvre le comptage des requêtes pour la suite de la tâche courante
+# (à clôturer avec close_query_scope)
+def open_query_scope(name):
+    scope = QueryScope(name)
+    _current_query_scope.set(scope)
+    return scope
+
+
+# Clôture un comptage : agrégats de /debug_queries et journal
+def close_query_scope(scope):
+    query_stats.record(scope)
+    query_logger.info(
+        f"🗄️ {scope.name}: {scope.count} requête(s), {scope.duration:.1f} ms en base"
     )
-    Session = sessionmaker(bind=engine)
-    print("✅ Connexion à la base de données configurée")
-except Exception as e:
-    print(f"❌ Erreur de connexion à la base de données: {e}")
-    sys.exit(1)
+
+
+# Ouvre le comptage des requêtes d'un bloc, journalisé à la fin
+@contextmanager
+def query_scope(name):
+    scope = QueryScope(name)
+    token = _current_query_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_query_scope.reset(token)
+        close_query_scope(scope)
+
+
+_PARAMETER = re.compile(r"%\(\w+\)s|\$\d+|\?|'(?:[^']|'')*'|\b\d+\b")
+_PARAMETER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+
+
+# SQL normalisé : paramètres et littéraux remplacés par ?, listes IN repliées
+def normalize_sql(statement):
+    sql = " ".join(statement.split())
+    sql = _PARAMETER.sub("?", sql)
+    return _PARAMETER_LIST.sub("?, ...", sql)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = (perf_counter() - context._query_start) * 1000
+    scope = _current_query_scope.get()
+    if scope is not None:
+        scope.count += 1
+        scope.duration += elapsed
+    if elapsed >= SLOW_QUERY_MS:
+        sql = normalize_sql(statement)
+        if scope is not None:
+            scope.slow.append((elapsed, sql))
+        query_logger.warning(
+            f"🐢 Requête lente ({elapsed:.0f} ms) "
+            f"[{scope.name if scope else 'hors interaction'}]: {sql}"
+        )
 
 
 # Status des membres (Actif, Inactif, Suspendu)
@@ -54,8 +267,23 @@ class MemberStatus(enum.Enum):
     SUSPENDED = "suspendu"
 
 
+# Index trigrammes (pg_trgm) pour la recherche floue de membres (Postgres)
+def _trigram_index(column):
+    return Index(
+        f"ix_members_{column}_trgm",
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column: "gin_trgm_ops"},
+    ).ddl_if(dialect="postgresql")
+
+
 class Member(Base):
     __tablename__ = "members"
+    __table_args__ = (
+        _trigram_index("full_name"),
+        _trigram_index("username"),
+        _trigram_index("email"),
+    )
 
     id = Column(Integer, primary_key=True)
     discord_id = Column(String(32), unique=True, nullable=False)
@@ -85,7 +313,8 @@ class Meeting(Base):
     date = Column(DateTime, nullable=False)
     created_by = Column(String(32))  # Discord ID du créateur
     organizer_id = Column(Integer, ForeignKey("members.id"))  # Organisateur (membre)
-    target_roles = Column(Text)  # Rôles ciblés (JSON: ["DEV", "IA"] ou "ALL")
+    # Rôles ciblés (JSON: ["DEV", "IA"] ou ["ALL"]), copie lisible de target_role_links
+    target_roles = Column(Text)
     is_completed = Column(Boolean, default=False)
     attendance_validated = Column(Boolean, default=False)  # Appel validé
     attendance_validated_at = Column(DateTime)  # Date de validation
@@ -95,29 +324,61 @@ class Meeting(Base):
     organizer = relationship(
         "Member", back_populates="organized_meetings", foreign_keys=[organizer_id]
     )
+    # Rôles ciblés normalisés, utilisés pour filtrer les réunions en SQL
+    target_role_links = relationship(
+        "MeetingTargetRole", back_populates="meeting", cascade="all, delete-orphan"
+    )
 
     # Retourne les rôles ciblés sous forme de liste
     def get_target_roles(self):
-        if not self.target_roles:
+        return Meeting.parse_target_roles(self.target_roles)
+
+    # Décode la valeur JSON stockée dans target_roles
+    @staticmethod
+    def parse_target_roles(value):
+        if not value:
             return []
         try:
-            roles = json.loads(self.target_roles)
+            roles = json.loads(value)
             return roles if isinstance(roles, list) else []
         except:
             return []
 
     # Définit les rôles ciblés à partir d'une liste ou "ALL"
+    # (met à jour la colonne JSON et la table meeting_target_roles)
     def set_target_roles(self, roles):
         if roles == "ALL" or roles == ["ALL"]:
-            self.target_roles = json.dumps(["ALL"])
-        else:
-            self.target_roles = json.dumps(
-                roles if isinstance(roles, list) else [roles]
-            )
+            roles = ["ALL"]
+        elif not isinstance(roles, list):
+            roles = [roles]
+        self.target_roles = json.dumps(roles)
+        self.target_role_links = [
+            MeetingTargetRole(role=role) for role in dict.fromkeys(roles)
+        ]
+
+
+# Rôle ciblé par une réunion (une ligne par rôle, "ALL" pour tout le monde)
+class MeetingTargetRole(Base):
+    __tablename__ = "meeting_target_roles"
+    __table_args__ = (
+        # Recherche des réunions d'un rôle donné
+        Index("ix_meeting_target_roles_role_meeting", "role", "meeting_id"),
+    )
+
+    meeting_id = Column(
+        Integer, ForeignKey("meetings.id", ondelete="CASCADE"), primary_key=True
+    )
+    role = Column(String(10), primary_key=True)  # DEV, IA, INFRA ou ALL
+
+    meeting = relationship("Meeting", back_populates="target_role_links")
 
 
 class Attendance(Base):
     __tablename__ = "attendances"
+    __table_args__ = (
+        # Une seule présence par membre et par réunion (cible des upserts)
+        Index("uq_attendances_meeting_member", "meeting_id", "member_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
     member_id = Column(Integer, ForeignKey("members.id"))
@@ -131,6 +392,24 @@ class Attendance(Base):
     meeting = relationship("Meeting", back_populates="attendances")
 
 
+# Agrégat des présences par membre, rôles ciblés, jour de réunion et statut
+# Les rôles ciblés permettent de ne compter que les réunions qui concernent le
+# pôle d'un membre. Ne compte que les réunions dont l'appel est validé ;
+# maintenu par Database.record_attendance / validate_attendance et reconstruit
+# par rebuild_attendance_summary
+class MemberAttendanceSummary(Base):
+    __tablename__ = "member_attendance_by_target"
+    __table_args__ = (
+        PrimaryKeyConstraint("member_id", "target_roles", "day", "status"),
+    )
+
+    member_id = Column(Integer, ForeignKey("members.id", ondelete="CASCADE"))
+    target_roles = Column(Text)  # Meeting.target_roles de la réunion ("[]" si vide)
+    day = Column(Date)  # Jour de la réunion
+    status = Column(String(20))  # present, absent, excused
+    count = Column(Integer, nullable=False, default=0)
+
+
 # Status des tickets
 class TicketStatus(enum.Enum):
     OPEN = "open"
@@ -172,17 +451,142 @@ class TicketSettings(Base):
     log_channel_id = Column(String(32))  # Channel pour logs des tickets
 
 
+# Empreinte du dernier arbre de commandes synchronisé avec Discord, par portée
+# ("global" ou ID du serveur), pour ne relancer tree.sync() qu'en cas de changement
+class CommandSync(Base):
+    __tablename__ = "command_sync"
+
+    scope = Column(String(32), primary_key=True)
+    tree_hash = Column(String(64), nullable=False)
+    synced_at = Column(DateTime, default=datetime.utcnow)
+
+
 # Initialise la base de données (crée les tables)
 def init_database():
     try:
+        engine = get_engine()
+        # Extension nécessaire aux index trigrammes (déjà créée par init.sql)
+        if engine.dialect.name == "postgresql":
+            with engine.begin() as conn:
+                conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        # Les index ajoutés à des tables existantes sont créés par migrations.py
         Base.metadata.create_all(engine)
         print("✅ Tables de base de données créées/vérifiées")
+        migrate_target_roles()
+        migrate_attendance_summary()
         return True
     except Exception as e:
         print(f"❌ Erreur lors de la création des tables: {e}")
         return False
 
 
+# Supprime les présences en double (même réunion, même membre) en gardant la
+# plus récente, avant la création de l'index unique (migration 5)
+def dedupe_attendances():
+    indexes = inspect(get_engine()).get_indexes(Attendance.__tablename__)
+    if any(index["name"] == "uq_attendances_meeting_member" for index in indexes):
+        return
+
+    session = Session()
+    try:
+        latest = (
+            select(func.max(Attendance.id))
+            .where(Attendance.meeting_id.isnot(None), Attendance.member_id.isnot(None))
+            .group_by(Attendance.meeting_id, Attendance.member_id)
+        )
+        removed = (
+            session.query(Attendance)
+            .filter(
+                Attendance.meeting_id.isnot(None),
+                Attendance.member_id.isnot(None),
+                Attendance.id.not_in(latest),
+            )
+            .delete(synchronize_session=False)
+        )
+        if removed:
+            rebuild_attendance_summary(session)
+        session.commit()
+        if removed:
+            print(f"✅ {removed} présence(s) en double supprimée(s)")
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+# Remplit meeting_target_roles à partir de la colonne JSON pour les réunions
+# créées avant l'ajout de la table (idempotent)
+def migrate_target_roles():
+    session = Session()
+    try:
+        meetings = session.query(Meeting).filter(~Meeting.target_role_links.any()).all()
+        migrated = 0
+        for meeting in meetings:
+            roles = meeting.get_target_roles()
+            if roles:
+                meeting.set_target_roles(roles)
+                migrated += 1
+        session.commit()
+        if migrated:
+            print(f"✅ Rôles ciblés migrés pour {migrated} réunion(s)")
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+# Recalcule le résumé des présences à partir de l'historique des présences
+# Retourne le nombre de lignes insérées (la transaction reste à l'appelant)
+def rebuild_attendance_summary(session):
+    session.query(MemberAttendanceSummary).delete(synchronize_session=False)
+    target_roles = func.coalesce(Meeting.target_roles, "[]")
+    rows = (
+        select(
+            Attendance.member_id,
+            target_roles,
+            func.date(Meeting.date),
+            Attendance.status,
+            func.count(Attendance.id),
+        )
+        .join(Meeting, Attendance.meeting_id == Meeting.id)
+        .where(
+            Meeting.attendance_validated == True,
+            Attendance.member_id.isnot(None),
+            Attendance.status.isnot(None),
+        )
+        .group_by(
+            Attendance.member_id,
+            target_roles,
+            func.date(Meeting.date),
+            Attendance.status,
+        )
+    )
+    result = session.execute(
+        insert(MemberAttendanceSummary).from_select(
+            ["member_id", "target_roles", "day", "status", "count"], rows
+        )
+    )
+    return result.rowcount
+
+
+# Remplit le résumé des présences s'il est vide (première mise en place)
+def migrate_attendance_summary():
+    session = Session()
+    try:
+        if session.query(MemberAttendanceSummary).first() is None:
+            count = rebuild_attendance_summary(session)
+            session.commit()
+            if count:
+                print(f"✅ Résumé des présences reconstruit ({count} ligne(s))")
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
 # Initialiser au chargement du module
 if __name__ == "__main__":
     init_database()
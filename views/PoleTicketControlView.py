@@ -1,9 +1,11 @@
 import discord
 import asyncio
+from database import unit_of_work
+from metrics import TimedView
 from views.RejectReasonModal import RejectReasonModal
 
 
-class PoleTicketControlView(discord.ui.View):
+class PoleTicketControlView(TimedView):
     """Vue avec les boutons de contrôle pour un ticket de pôle"""
 
     def __init__(self, db, ticket_id, pole):
@@ -24,7 +26,7 @@ class PoleTicketControlView(discord.ui.View):
             )
             return
 
-        ticket = self.db.get_ticket_by_channel(str(interaction.channel.id))
+        ticket = await self.db.get_ticket_by_channel(str(interaction.channel.id))
         if not ticket:
             await interaction.response.send_message(
                 "❌ Ticket introuvable.", ephemeral=True
@@ -40,7 +42,7 @@ class PoleTicketControlView(discord.ui.View):
             return
 
         # Mettre à jour le membre en base
-        member = self.db.get_member(ticket.discord_user_id)
+        member = await self.db.get_member(ticket.discord_user_id)
         if member:
             # Retirer l'ancien rôle si existant
             if member.role:
@@ -48,14 +50,18 @@ class PoleTicketControlView(discord.ui.View):
                 if old_role and old_role in user.roles:
                     await user.remove_roles(old_role)
 
-            # Mettre à jour en base
-            self.db.update_member(ticket.discord_user_id, role=self.pole)
-
             # Ajouter le nouveau rôle Discord
             new_role = discord.utils.get(interaction.guild.roles, name=self.pole)
             if new_role:
                 await user.add_roles(new_role)
 
+            # Mettre à jour le membre et fermer le ticket en une seule transaction
+            async with unit_of_work():
+                await self.db.update_member(ticket.discord_user_id, role=self.pole)
+                await self.db.close_ticket(
+                    str(interaction.channel.id), str(interaction.user.id)
+                )
+
             embed = discord.Embed(
                 title="✅ Demande Acceptée!",
                 description=f"{user.mention} a été ajouté au pôle **{self.pole}** avec succès!",
@@ -74,8 +80,7 @@ class PoleTicketControlView(discord.ui.View):
             )
             await asyncio.sleep(10)
 
-            # Fermer le ticket
-            self.db.close_ticket(str(interaction.channel.id), str(interaction.user.id))
+            # Supprimer le salon du ticket
             await interaction.channel.delete(
                 reason=f"Demande acceptée par {interaction.user}"
             )
@@ -106,7 +111,7 @@ class PoleTicketControlView(discord.ui.View):
     ):
         # Vérifier les permissions
         if not interaction.user.guild_permissions.manage_channels:
-            ticket = self.db.get_ticket_by_channel(str(interaction.channel.id))
+            ticket = await self.db.get_ticket_by_channel(str(interaction.channel.id))
             if ticket and ticket.discord_user_id != str(interaction.user.id):
                 await interaction.response.send_message(
                     "❌ Seuls les administrateurs ou le créateur peuvent fermer ce ticket.",
@@ -119,7 +124,9 @@ class PoleTicketControlView(discord.ui.View):
         )
 
         # Fermer le ticket en base
-        self.db.close_ticket(str(interaction.channel.id), str(interaction.user.id))
+        await self.db.close_ticket(
+            str(interaction.channel.id), str(interaction.user.id)
+        )
 
         await asyncio.sleep(5)
         await interaction.channel.delete(reason=f"Ticket fermé par {interaction.user}")
@@ -128,7 +135,7 @@ class PoleTicketControlView(discord.ui.View):
     async def ticket_info(
         self, interaction: discord.Interaction, button: discord.ui.Button
     ):
-        ticket = self.db.get_ticket_by_channel(str(interaction.channel.id))
+        ticket = await self.db.get_ticket_by_channel(str(interaction.channel.id))
 
         if not ticket:
             await interaction.response.send_message(
@@ -137,7 +144,7 @@ class PoleTicketControlView(discord.ui.View):
             return
 
         # Récupérer les infos du membre
-        member = self.db.get_member(ticket.discord_user_id)
+        member = await self.db.get_member(ticket.discord_user_id)
 
         embed = discord.Embed(
             title="📊 Informations du Ticket", color=discord.Color.blue()
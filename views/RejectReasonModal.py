@@ -1,8 +1,9 @@
 import discord
 import asyncio
+from metrics import TimedModal
 
 
-class RejectReasonModal(discord.ui.Modal, title="Raison du refus"):
+class RejectReasonModal(TimedModal, title="Raison du refus"):
     """Modal pour saisir la raison du refus"""
 
     reason = discord.ui.TextInput(
@@ -19,7 +20,7 @@ class RejectReasonModal(discord.ui.Modal, title="Raison du refus"):
         self.pole = pole
 
     async def on_submit(self, interaction: discord.Interaction):
-        ticket = self.db.get_ticket_by_channel(str(interaction.channel.id))
+        ticket = await self.db.get_ticket_by_channel(str(interaction.channel.id))
         if not ticket:
             await interaction.response.send_message(
                 "❌ Ticket introuvable.", ephemeral=True
@@ -65,7 +66,9 @@ class RejectReasonModal(discord.ui.Modal, title="Raison du refus"):
         )
         await asyncio.sleep(10)
 
-        self.db.close_ticket(str(interaction.channel.id), str(interaction.user.id))
+        await self.db.close_ticket(
+            str(interaction.channel.id), str(interaction.user.id)
+        )
         await interaction.channel.delete(
             reason=f"Demande refusée par {interaction.user}"
         )
@@ -1,11 +1,12 @@
 import discord
 import asyncio
 import logging
+from metrics import TimedView
 
 logger = logging.getLogger(__name__)
 
 
-class TicketControlView(discord.ui.View):
+class TicketControlView(TimedView):
     """Vue avec les boutons de contrôle pour un ticket"""
 
     def __init__(self, db, ticket_id):
@@ -19,7 +20,7 @@ class TicketControlView(discord.ui.View):
     ):
         # Vérifier les permissions : admins (manage_channels) ou créateur du ticket
         if not interaction.user.guild_permissions.manage_channels:
-            ticket = self.db.get_ticket_by_channel(str(interaction.channel.id))
+            ticket = await self.db.get_ticket_by_channel(str(interaction.channel.id))
             if ticket and ticket.discord_user_id != str(interaction.user.id):
                 await interaction.response.send_message(
                     "❌ Seuls les administrateurs ou le créateur peuvent fermer ce ticket.",
@@ -32,13 +33,13 @@ class TicketControlView(discord.ui.View):
         )
 
         # Fermer le ticket en base
-        ticket = self.db.close_ticket(
+        ticket = await self.db.close_ticket(
             str(interaction.channel.id), str(interaction.user.id)
         )
 
         # Log la fermeture si configuré
         try:
-            settings = self.db.get_ticket_settings(str(interaction.guild.id))
+            settings = await self.db.get_ticket_settings(str(interaction.guild.id))
             if getattr(settings, "log_channel_id", None):
                 log_ch = interaction.guild.get_channel(int(settings.log_channel_id))
                 if log_ch and ticket:
@@ -79,7 +80,7 @@ class TicketControlView(discord.ui.View):
             )
             return
 
-        ticket = self.db.assign_ticket(
+        ticket = await self.db.assign_ticket(
             str(interaction.channel.id), str(interaction.user.id)
         )
 
@@ -106,7 +107,7 @@ class TicketControlView(discord.ui.View):
     async def ticket_info(
         self, interaction: discord.Interaction, button: discord.ui.Button
     ):
-        ticket = self.db.get_ticket_by_channel(str(interaction.channel.id))
+        ticket = await self.db.get_ticket_by_channel(str(interaction.channel.id))
 
         if not ticket:
             await interaction.response.send_message(
@@ -1,12 +1,13 @@
 import discord
 import asyncio
-from database import Database
+from database import AsyncDatabase
+from metrics import TimedView
 from views.TicketControlView import TicketControlView
 from views.PoleTicketControlView import PoleTicketControlView
 
 
 class TicketTypeSelect(discord.ui.Select):
-    def __init__(self, db: Database):
+    def __init__(self, db: AsyncDatabase):
         options = [
             discord.SelectOption(
                 label="Rejoindre DEV",
@@ -44,7 +45,7 @@ class TicketTypeSelect(discord.ui.Select):
         choice = self.values[0]
 
         # Récupérer / créer la catégorie de tickets
-        settings = self.db.get_ticket_settings(str(interaction.guild.id))
+        settings = await self.db.get_ticket_settings(str(interaction.guild.id))
         if not settings.tickets_enabled:
             await interaction.followup.send(
                 "❌ Le système de tickets est actuellement désactivé.",
@@ -69,7 +70,7 @@ class TicketTypeSelect(discord.ui.Select):
 
         if not category:
             category = await interaction.guild.create_category("📋 TICKETS")
-            self.db.update_ticket_settings(
+            await self.db.update_ticket_settings(
                 str(interaction.guild.id), ticket_category_id=str(category.id)
             )
 
@@ -114,7 +115,7 @@ class TicketTypeSelect(discord.ui.Select):
 
         # Créer le ticket en base
         if is_pole:
-            ticket = self.db.create_ticket(
+            ticket = await self.db.create_ticket(
                 discord_user_id=str(interaction.user.id),
                 discord_username=interaction.user.name,
                 channel_id=str(channel.id),
@@ -123,7 +124,7 @@ class TicketTypeSelect(discord.ui.Select):
                 reason=None,
             )
         else:
-            ticket = self.db.create_ticket(
+            ticket = await self.db.create_ticket(
                 discord_user_id=str(interaction.user.id),
                 discord_username=interaction.user.name,
                 channel_id=str(channel.id),
@@ -200,8 +201,8 @@ class TicketTypeSelect(discord.ui.Select):
         )
 
 
-class TicketCreationView(discord.ui.View):
+class TicketCreationView(TimedView):
     def __init__(self):
         super().__init__(timeout=None)
-        self.db = Database()
+        self.db = AsyncDatabase()
         self.add_item(TicketTypeSelect(self.db))
@@ -1,30 +1,99 @@
+import asyncio
 import discord
 from discord.ext import commands
 import logging
+from metrics import TimedModal, TimedView
 
 logger = logging.getLogger(__name__)
 
 
-class TicketListView(discord.ui.View):
-    """Vue avec pagination pour la liste des tickets"""
+class TicketListView(TimedView):
+    """Vue avec pagination pour la liste des tickets
 
-    def __init__(self, tickets, db, per_page=5):
+    Seule la page affichée est gardée en mémoire : chaque page est lue en base
+    par pagination keyset sur (created_at, id), et la page suivante dans le sens
+    de navigation est préchargée pendant que l'utilisateur lit la page courante.
+    """
+
+    def __init__(self, db, total, per_page=5):
         super().__init__(timeout=180)  # 3 minutes
-        self.tickets = tickets
         self.db = db
         self.per_page = per_page
+        self.filter_type = "all"
+        self.total = total
         self.current_page = 0
-        self.max_page = (len(tickets) - 1) // per_page if tickets else 0
+        self.page_tickets = []
+        self._prefetch = None  # (requête, tâche) de la page préchargée
+
+    @property
+    def max_page(self):
+        return (self.total - 1) // self.per_page if self.total else 0
+
+    @staticmethod
+    def _key(ticket):
+        return (ticket.created_at, ticket.id)
+
+    def _fetch(self, query):
+        return self.db.get_open_tickets_page(filter_type=self.filter_type, **query)
+
+    def _cancel_prefetch(self):
+        if self._prefetch:
+            self._prefetch[1].cancel()
+            self._prefetch = None
+
+    async def load_page(self, page, **query):
+        """Charger une page (depuis la page préchargée si c'est la même requête)"""
+        query.setdefault("limit", self.per_page)
+        prefetch, self._prefetch = self._prefetch, None
+        if prefetch and prefetch[0] == query:
+            tickets = await prefetch[1]
+        else:
+            if prefetch:
+                prefetch[1].cancel()
+            tickets = await self._fetch(query)
+
+        self.current_page = max(0, min(page, self.max_page))
+        self.page_tickets = tickets
+        self.update_buttons()
+
+        # Précharger la page voisine dans le sens de navigation
+        backwards = "before" in query or query.get("last")
+        if tickets and backwards and self.current_page > 0:
+            self._start_prefetch(before=self._key(tickets[0]))
+        elif tickets and not backwards and self.current_page < self.max_page:
+            self._start_prefetch(after=self._key(tickets[-1]))
+
+    def _start_prefetch(self, **query):
+        query["limit"] = self.per_page
+        self._prefetch = (query, asyncio.create_task(self._fetch(query)))
+
+    async def reload(self):
+        """Recompter les tickets et relire la page courante à partir de son
+        premier ticket (la dernière page si elle a été vidée entre-temps)"""
+        self._cancel_prefetch()
+        self.total = await self.db.count_open_tickets(self.filter_type)
+        if self.page_tickets:
+            await self.load_page(
+                self.current_page, after=self._key(self.page_tickets[0]), inclusive=True
+            )
+        else:
+            await self.load_page(0)
+        if not self.page_tickets and self.total:
+            await self.load_last_page()
+
+    async def load_last_page(self):
+        remainder = self.total - self.max_page * self.per_page
+        await self.load_page(self.max_page, last=True, limit=remainder or self.per_page)
 
     def get_embed(self, interaction: discord.Interaction):
         """Créer l'embed pour la page actuelle"""
         start = self.current_page * self.per_page
-        end = start + self.per_page
-        page_tickets = self.tickets[start:end]
+        end = start + len(self.page_tickets)
+        page_tickets = self.page_tickets
 
         embed = discord.Embed(
             title=f"📋 Tickets Ouverts - Page {self.current_page + 1}/{self.max_page + 1}",
-            description=f"Total: {len(self.tickets)} tickets ouverts",
+            description=f"Total: {self.total} tickets ouverts",
             color=discord.Color.blue(),
             timestamp=discord.utils.utcnow(),
         )
@@ -80,7 +149,7 @@ class TicketListView(discord.ui.View):
         # Footer avec navigation
         embed.set_footer(
             text=f"Page {self.current_page + 1}/{self.max_page + 1} • "
-            f"Tickets {start + 1}-{min(end, len(self.tickets))} sur {len(self.tickets)}"
+            f"Tickets {start + 1}-{end} sur {self.total}"
         )
 
         return embed
@@ -109,8 +178,7 @@ class TicketListView(discord.ui.View):
         self, interaction: discord.Interaction, button: discord.ui.Button
     ):
         """Aller à la première page"""
-        self.current_page = 0
-        self.update_buttons()
+        await self.load_page(0)
         embed = self.get_embed(interaction)
         await interaction.response.edit_message(embed=embed, view=self)
 
@@ -119,9 +187,12 @@ class TicketListView(discord.ui.View):
         self, interaction: discord.Interaction, button: discord.ui.Button
     ):
         """Page précédente"""
-        if self.current_page > 0:
-            self.current_page -= 1
-            self.update_buttons()
+        if self.current_page > 0 and self.page_tickets:
+            await self.load_page(
+                self.current_page - 1, before=self._key(self.page_tickets[0])
+            )
+            if not self.page_tickets:
+                await self.reload()
             embed = self.get_embed(interaction)
             await interaction.response.edit_message(embed=embed, view=self)
 
@@ -130,9 +201,13 @@ class TicketListView(discord.ui.View):
         self, interaction: discord.Interaction, button: discord.ui.Button
     ):
         """Page suivante"""
-        if self.current_page < self.max_page:
-            self.current_page += 1
-            self.update_buttons()
+        if self.current_page < self.max_page and self.page_tickets:
+            await self.load_page(
+                self.current_page + 1, after=self._key(self.page_tickets[-1])
+            )
+            if not self.page_tickets:
+                # Tickets fermés entre-temps : recompter
+                await self.reload()
             embed = self.get_embed(interaction)
             await interaction.response.edit_message(embed=embed, view=self)
 
@@ -141,8 +216,7 @@ class TicketListView(discord.ui.View):
         self, interaction: discord.Interaction, button: discord.ui.Button
     ):
         """Aller à la dernière page"""
-        self.current_page = self.max_page
-        self.update_buttons()
+        await self.load_last_page()
         embed = self.get_embed(interaction)
         await interaction.response.edit_message(embed=embed, view=self)
 
@@ -153,15 +227,8 @@ class TicketListView(discord.ui.View):
         self, interaction: discord.Interaction, button: discord.ui.Button
     ):
         """Rafraîchir la liste des tickets"""
-        # Recharger les tickets depuis la base
-        self.tickets = self.db.get_open_tickets()
-        self.max_page = (len(self.tickets) - 1) // self.per_page if self.tickets else 0
-
-        # Ajuster la page si nécessaire
-        if self.current_page > self.max_page:
-            self.current_page = self.max_page
-
-        self.update_buttons()
+        # Recompter et relire uniquement la page affichée
+        await self.reload()
         embed = self.get_embed(interaction)
         await interaction.response.edit_message(embed=embed, view=self)
 
@@ -170,21 +237,12 @@ class TicketListView(discord.ui.View):
         self, interaction: discord.Interaction, button: discord.ui.Button
     ):
         """Afficher les statistiques rapides"""
-        # Compter par type et statut
-        stats = {
-            "total": len(self.tickets),
-            "join_labo": sum(1 for t in self.tickets if t.type.value == "join_labo"),
-            "join_pole": sum(1 for t in self.tickets if t.type.value == "join_pole"),
-            "assigned": sum(1 for t in self.tickets if t.assigned_to),
-            "unassigned": sum(1 for t in self.tickets if not t.assigned_to),
+        # Compter par type, statut et pôle (une requête GROUP BY)
+        stats = await self.db.get_open_tickets_summary()
+        pole_stats = {
+            pole: stats["poles"].get(pole, 0) for pole in ("DEV", "IA", "INFRA")
         }
 
-        # Compter par pôle
-        pole_stats = {"DEV": 0, "IA": 0, "INFRA": 0}
-        for ticket in self.tickets:
-            if ticket.pole_requested in pole_stats:
-                pole_stats[ticket.pole_requested] += 1
-
         embed = discord.Embed(
             title="📊 Statistiques Rapides",
             color=discord.Color.blue(),
@@ -238,27 +296,11 @@ class TicketListView(discord.ui.View):
         self, interaction: discord.Interaction, select: discord.ui.Select
     ):
         """Filtrer les tickets"""
-        filter_type = select.values[0]
-
-        # Récupérer tous les tickets
-        all_tickets = self.db.get_open_tickets()
-
-        # Appliquer le filtre
-        if filter_type == "all":
-            self.tickets = all_tickets
-        elif filter_type == "join_labo":
-            self.tickets = [t for t in all_tickets if t.type.value == "join_labo"]
-        elif filter_type == "join_pole":
-            self.tickets = [t for t in all_tickets if t.type.value == "join_pole"]
-        elif filter_type == "unassigned":
-            self.tickets = [t for t in all_tickets if not t.assigned_to]
-        elif filter_type == "assigned":
-            self.tickets = [t for t in all_tickets if t.assigned_to]
-
-        # Réinitialiser la pagination
-        self.current_page = 0
-        self.max_page = (len(self.tickets) - 1) // self.per_page if self.tickets else 0
-        self.update_buttons()
+        # Le filtre est appliqué en SQL, pagination réinitialisée
+        self._cancel_prefetch()
+        self.filter_type = select.values[0]
+        self.total = await self.db.count_open_tickets(self.filter_type)
+        await self.load_page(0)
 
         embed = self.get_embed(interaction)
         await interaction.response.edit_message(embed=embed, view=self)
@@ -267,9 +309,11 @@ class TicketListView(discord.ui.View):
         """Désactiver tous les boutons après timeout"""
         for item in self.children:
             item.disabled = True
+        self._cancel_prefetch()
+        self.page_tickets = []
 
 
-class QuickActionModal(discord.ui.Modal, title="Action rapide sur ticket"):
+class QuickActionModal(TimedModal, title="Action rapide sur ticket"):
     """Modal pour effectuer une action rapide sur un ticket"""
 
     ticket_id = discord.ui.TextInput(
@@ -308,10 +352,9 @@ class QuickActionModal(discord.ui.Modal, title="Action rapide sur ticket"):
             return
 
         # Récupérer le ticket
-        tickets = self.db.get_open_tickets()
-        ticket = next((t for t in tickets if t.id == ticket_id), None)
+        ticket = await self.db.get_ticket(ticket_id)
 
-        if not ticket:
+        if not ticket or ticket.status.value != "open":
             await interaction.response.send_message(
                 f"❌ Ticket #{ticket_id} introuvable", ephemeral=True
             )
@@ -320,8 +363,14 @@ class QuickActionModal(discord.ui.Modal, title="Action rapide sur ticket"):
         action = self.action.value.lower()
 
         if action == "close":
-            # Fermer le ticket
-            self.db.close_ticket(ticket.channel_id, str(interaction.user.id))
+            # Fermer le ticket (None s'il a été fermé entre-temps)
+            if not await self.db.close_ticket_by_id(
+                ticket_id, str(interaction.user.id)
+            ):
+                await interaction.response.send_message(
+                    f"❌ Ticket #{ticket_id} déjà fermé", ephemeral=True
+                )
+                return
 
             # Supprimer le canal si possible
             channel = interaction.guild.get_channel(int(ticket.channel_id))
@@ -333,8 +382,15 @@ class QuickActionModal(discord.ui.Modal, title="Action rapide sur ticket"):
             )
 
         elif action == "assign":
-            # S'assigner le ticket
-            self.db.assign_ticket(ticket.channel_id, str(interaction.user.id))
+            # S'assigner le ticket (None s'il a été fermé entre-temps)
+            if not await self.db.assign_ticket(
+                ticket.channel_id, str(interaction.user.id)
+            ):
+                await interaction.response.send_message(
+                    f"❌ Ticket #{ticket_id} déjà fermé", ephemeral=True
+                )
+                return
+
             await interaction.response.send_message(
                 f"✅ Ticket #{ticket_id} vous a été assigné", ephemeral=True
             )
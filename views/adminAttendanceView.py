@@ -2,12 +2,14 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from config import ADMIN_ROLES
+from database import unit_of_work
 import logging
+from metrics import TimedView
 
 logger = logging.getLogger(__name__)
 
 # Vue Admin améliorée pour gérer l'appel complet
-class AdminAttendanceView(discord.ui.View):
+class AdminAttendanceView(TimedView):
     def __init__(self, meeting_id, db, initiator_id, expected_members):
         super().__init__(timeout=1800)  # 30 minutes
         self.meeting_id = meeting_id
@@ -19,9 +21,6 @@ class AdminAttendanceView(discord.ui.View):
         self.attendance_status = {}
         self.validated = False
 
-        # Initialiser avec les statuts existants
-        self._load_existing_attendance()
-
         # Initialiser (ou mettre à jour) le select décoré défini plus bas
         first_page_members = self.get_current_page_members()
         select_options = []
@@ -76,12 +75,36 @@ class AdminAttendanceView(discord.ui.View):
             return name
         return name[: max_length - 3] + "..."
 
-    def _load_existing_attendance(self):
+    async def load_existing_attendance(self):
         # Charger les statuts d'assiduité existants depuis la base de données
-        attendances = self.db.get_meeting_attendance(self.meeting_id)
+        # (à attendre après la construction de la vue)
+        attendances = await self.db.get_meeting_attendance(self.meeting_id)
         for att, member in attendances:
             self.attendance_status[member.id] = att.status
 
+    async def record_status(self, member_id, status, marked_by):
+        # Enregistrer le statut d'un membre et le persister immédiatement
+        self.attendance_status[member_id] = status
+        await self.db.record_attendance(
+            self.meeting_id, member_id, status, modified_by=marked_by
+        )
+
+    async def save_validation(self, validated_by):
+        # Marquer les membres non marqués comme absents (une seule requête) et
+        # valider l'appel dans la même transaction
+        unmarked = {
+            member.id: "absent"
+            for member in self.members
+            if member.id not in self.attendance_status
+        }
+        async with unit_of_work():
+            await self.db.record_attendance_bulk(
+                self.meeting_id, unmarked, modified_by=validated_by
+            )
+            await self.db.validate_attendance(self.meeting_id, validated_by)
+        self.attendance_status.update(unmarked)
+        self.validated = True
+
     def get_current_page_members(self):
         """Récupérer les membres de la page actuelle"""
         start = self.page * self.members_per_page
@@ -129,15 +152,8 @@ class AdminAttendanceView(discord.ui.View):
             )
             return
 
-        # Enregistrer le statut
-        self.attendance_status[self.selected_member_id] = status
-
-        # Persister en base de données
-        self.db.record_attendance(
-            self.meeting_id,
-            self.selected_member_id,
-            status,
-            modified_by=str(interaction.user.id),
+        await self.record_status(
+            self.selected_member_id, status, str(interaction.user.id)
         )
 
         # Trouver le membre pour afficher son nom
@@ -205,7 +221,7 @@ class AdminAttendanceView(discord.ui.View):
 
         # Vérifier que l'utilisateur est autorisé
         if str(interaction.user.id) != self.initiator_id:
-            member = self.db.get_member(str(interaction.user.id))
+            member = await self.db.get_member(str(interaction.user.id))
             is_admin = any(role.name in ADMIN_ROLES for role in interaction.user.roles)
             if not is_admin:
                 await interaction.response.send_message(
@@ -213,20 +229,7 @@ class AdminAttendanceView(discord.ui.View):
                 )
                 return
 
-        # Marquer les membres non marqués comme absents
-        for member in self.members:
-            if member.id not in self.attendance_status:
-                self.attendance_status[member.id] = "absent"
-                self.db.record_attendance(
-                    self.meeting_id,
-                    member.id,
-                    "absent",
-                    modified_by=str(interaction.user.id),
-                )
-
-        # Valider l'appel en base de données
-        self.db.validate_attendance(self.meeting_id, str(interaction.user.id))
-        self.validated = True
+        await self.save_validation(str(interaction.user.id))
 
         # Désactiver tous les boutons
         for item in self.children:
@@ -258,7 +261,7 @@ class AdminAttendanceView(discord.ui.View):
         if self.validated:
             return
 
-        meeting = self.db.get_meeting(self.meeting_id)
+        meeting = await self.db.get_meeting(self.meeting_id)
         target_roles = meeting.get_target_roles()
         roles_text = "Tous" if "ALL" in target_roles else ", ".join(target_roles)
 
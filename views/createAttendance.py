@@ -9,7 +9,7 @@ async def create_attendance_view(self, interaction, meeting):
         roles_text = "Tous" if "ALL" in target_roles else ", ".join(target_roles)
 
         # Récupérer les membres attendus
-        expected_members = self.db.get_members_by_roles(target_roles)
+        expected_members = await self.db.get_members_by_roles(target_roles)
 
         if not expected_members:
             await interaction.followup.send(
@@ -51,10 +51,11 @@ async def create_attendance_view(self, interaction, meeting):
             admin_view = AdminAttendanceView(
                 meeting.id, self.db, str(interaction.user.id), expected_members
             )
+            # Initialiser avec les statuts existants
+            await admin_view.load_existing_attendance()
 
             # Envoyer le message avec la vue
-            message = await interaction.followup.send(embed=embed, view=admin_view)
-            self.active_meetings[meeting.id] = message
+            await interaction.followup.send(embed=embed, view=admin_view)
 
         except Exception as e:
             logger.error(f"Erreur lors de la création de la vue d'appel: {str(e)}")
@@ -1,23 +1,50 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
+from collections import OrderedDict
 import logging
+from metrics import TimedView
 
 logger = logging.getLogger(__name__)
 
 # Vue pour la pagination de la liste des membres
-class MemberListView(discord.ui.View):
+# Les pages sont construites à la demande par page_provider (coroutine
+# page -> embed) et les dernières pages affichées sont gardées en cache (LRU)
+class MemberListView(TimedView):
 
-    def __init__(self, embeds):
+    def __init__(self, page_provider, page_count, first_embed=None, cache_size=5):
         super().__init__(timeout=180)  # 3 minutes
-        self.embeds = embeds
+        self.page_provider = page_provider
+        self.page_count = page_count
+        self.cache_size = cache_size
+        self.pages = OrderedDict()
+        if first_embed is not None:
+            self.pages[0] = first_embed
         self.current_page = 0
         self.update_buttons()
 
     # Mettre à jour l'état des boutons
     def update_buttons(self):
         self.previous.disabled = self.current_page == 0
-        self.next.disabled = self.current_page >= len(self.embeds) - 1
+        self.next.disabled = self.current_page >= self.page_count - 1
+
+    # Embed d'une page, construit au premier affichage puis lu dans le cache
+    async def get_page(self, page):
+        embed = self.pages.get(page)
+        if embed is None:
+            embed = await self.page_provider(page)
+            self.pages[page] = embed
+            while len(self.pages) > self.cache_size:
+                self.pages.popitem(last=False)
+        self.pages.move_to_end(page)
+        return embed
+
+    # Afficher une page
+    async def show_page(self, interaction, page):
+        self.current_page = page
+        self.update_buttons()
+        embed = await self.get_page(page)
+        await interaction.response.edit_message(embed=embed, view=self)
 
     @discord.ui.button(
         label="◀ Précédent", style=discord.ButtonStyle.primary, disabled=True
@@ -26,23 +53,16 @@ class MemberListView(discord.ui.View):
         self, interaction: discord.Interaction, button: discord.ui.Button
     ):
         if self.current_page > 0:
-            self.current_page -= 1
-            self.update_buttons()
-            await interaction.response.edit_message(
-                embed=self.embeds[self.current_page], view=self
-            )
+            await self.show_page(interaction, self.current_page - 1)
 
     @discord.ui.button(label="Suivant ▶", style=discord.ButtonStyle.primary)
     async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if self.current_page < len(self.embeds) - 1:
-            self.current_page += 1
-            self.update_buttons()
-            await interaction.response.edit_message(
-                embed=self.embeds[self.current_page], view=self
-            )
+        if self.current_page < self.page_count - 1:
+            await self.show_page(interaction, self.current_page + 1)
 
     @discord.ui.button(label="🏠", style=discord.ButtonStyle.secondary)
     async def home(self, interaction: discord.Interaction, button: discord.ui.Button):
-        self.current_page = 0
-        self.update_buttons()
-        await interaction.response.edit_message(embed=self.embeds[0], view=self)
\ No newline at end of file
+        await self.show_page(interaction, 0)
+
+    async def on_timeout(self):
+        self.pages.clear()